@@ -0,0 +1,43 @@
+import sys
+import time
+from rabbit_leap_bfs import bfs_rabbit_leap, make_initial_state, make_goal_state
+from rabbit_leap_dfs import iterative_dfs_rabbit_leap, iddfs_rabbit_leap
+from rabbit_leap_bidirectional import bidirectional_bfs_rabbit_leap
+
+def time_solver(solver, n):
+    start = time.perf_counter()
+    solution = solver(n)
+    elapsed = time.perf_counter() - start
+    return solution, elapsed
+
+def run_benchmark(max_n=14, max_bfs_n=10):
+    print(f"{'n':>3} {'moves':>6} {'bfs (s)':>10} {'bidir (s)':>10} {'speedup':>8}")
+    for n in range(1, max_n + 1):
+        fast, fast_time = time_solver(bidirectional_bfs_rabbit_leap, n)
+        assert len(fast) == n * n + 2 * n
+        if n <= max_bfs_n:
+            slow, slow_time = time_solver(bfs_rabbit_leap, n)
+            assert len(slow) == len(fast)
+            print(f"{n:>3} {len(fast):>6} {slow_time:>10.4f} {fast_time:>10.4f} {slow_time / fast_time:>7.1f}x")
+        else:
+            print(f"{n:>3} {len(fast):>6} {'-':>10} {fast_time:>10.4f} {'-':>8}")
+
+def compare_memory(max_n=8):
+    print(f"{'n':>3} {'solver':>14} {'expanded':>9} {'frontier':>9} {'visited':>8}")
+    for n in range(1, max_n + 1):
+        initial_state, goal_state = make_initial_state(n), make_goal_state(n)
+        depth_limit = n * n + 2 * n
+        runs = [("bfs", lambda stats: bfs_rabbit_leap(n, stats)),
+                ("iterative dfs", lambda stats: iterative_dfs_rabbit_leap(initial_state, goal_state, depth_limit, stats)),
+                ("iddfs", lambda stats: iddfs_rabbit_leap(initial_state, goal_state, depth_limit, stats))]
+        for name, run in runs:
+            stats = {}
+            solution = run(stats)
+            assert len(solution) == depth_limit
+            print(f"{n:>3} {name:>14} {stats['nodes_expanded']:>9} {stats['peak_frontier']:>9} {stats['peak_visited']:>8}")
+
+if __name__ == "__main__":
+    max_n = int(sys.argv[1]) if len(sys.argv) > 1 else 14
+    run_benchmark(max_n)
+    print()
+    compare_memory(min(max_n, 8))
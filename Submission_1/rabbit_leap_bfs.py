@@ -24,38 +24,61 @@ def get_successors(state):
                 successors.append((new_state, move_desc))
     return successors
 
-def bfs_rabbit_leap():
-    initial_state = ['E', 'E', 'E', '_', 'W', 'W', 'W']
-    goal_state = ['W', 'W', 'W', '_', 'E', 'E', 'E']
+def make_initial_state(n):
+    return ['E'] * n + ['_'] + ['W'] * n
+
+def make_goal_state(n):
+    return ['W'] * n + ['_'] + ['E'] * n
+
+def bfs_rabbit_leap(n=3, stats=None):
+    initial_state = make_initial_state(n)
+    goal_state = make_goal_state(n)
     queue = deque([(initial_state, [])])
     visited = set()
     visited.add(tuple(initial_state))
+    if stats is None:
+        stats = {}
+    stats.update(nodes_expanded=0, peak_frontier=1)
     
     while queue:
         state, path = queue.popleft()
         if state == goal_state:
+            stats['peak_visited'] = len(visited)
             return path
+        stats['nodes_expanded'] += 1
         for next_state, move in get_successors(state):
             state_tuple = tuple(next_state)
             if state_tuple not in visited:
                 visited.add(state_tuple)
                 queue.append((next_state, path + [move]))
+        stats['peak_frontier'] = max(stats['peak_frontier'], len(queue))
+    stats['peak_visited'] = len(visited)
     return None
 
+def iter_moves(solution):
+    # Parses each move string once, lazily, into (from, to, piece).
+    for move in solution:
+        piece, rest = move.split(' at ')
+        idx_from, idx_to = rest.split(' to ')
+        yield int(idx_from), int(idx_to), piece
+
+def iter_states(state, moves):
+    # Applies (from, to, piece) moves to a single board, yielding each move with the board after it.
+    for move in moves:
+        idx_from, idx_to, _ = move
+        state[idx_from], state[idx_to] = state[idx_to], state[idx_from]
+        yield move, state
+
 def print_solution():
     solution = bfs_rabbit_leap()
     if solution:
         print("BFS Solution found in", len(solution), "steps:")
-        state = ['E', 'E', 'E', '_', 'W', 'W', 'W']
+        state = make_initial_state(3)
         print("Initial state:", ''.join(state))
-        for i, move in enumerate(solution, 1):
-            print(f"Step {i}: {move} -> State: ", end='')
-            # Reconstruct state for display
-            idx_from = int(move.split(' at ')[1].split(' to ')[0])
-            idx_to = int(move.split(' to ')[1])
-            state[idx_from], state[idx_to] = state[idx_to], state[idx_from]
-            print(''.join(state))
+        for i, ((idx_from, idx_to, piece), state) in enumerate(iter_states(state, iter_moves(solution)), 1):
+            print(f"Step {i}: {piece} at {idx_from} to {idx_to} -> State: {''.join(state)}")
     else:
         print("No solution found with BFS.")
 
-print_solution()
\ No newline at end of file
+if __name__ == "__main__":
+    print_solution()
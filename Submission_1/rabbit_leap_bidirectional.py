@@ -0,0 +1,144 @@
+from rabbit_leap_bfs import make_initial_state, make_goal_state, iter_moves, iter_states
+
+class RabbitLeapBoard:
+    # A state is packed into one int: bit i of the high part is set when cell i
+    # holds an east rabbit, the low `shift` bits hold the gap index. Cells that
+    # are neither the gap nor an E hold a W.
+    def __init__(self, n):
+        self.n = n
+        self.size = 2 * n + 1
+        self.shift = self.size.bit_length()
+        self.gap_mask = (1 << self.shift) - 1
+
+    def pack(self, state):
+        east = 0
+        for idx, cell in enumerate(state):
+            if cell == 'E':
+                east |= 1 << idx
+        return (east << self.shift) | state.index('_')
+
+    def unpack(self, packed):
+        east = packed >> self.shift
+        gap = packed & self.gap_mask
+        state = []
+        for idx in range(self.size):
+            if idx == gap:
+                state.append('_')
+            elif (east >> idx) & 1:
+                state.append('E')
+            else:
+                state.append('W')
+        return state
+
+    def successors(self, packed):
+        # Same move order as get_successors: E from gap-1, gap-2, W from gap+1, gap+2.
+        east = packed >> self.shift
+        gap = packed & self.gap_mask
+        shift = self.shift
+        result = []
+        if gap > 0 and (east >> (gap - 1)) & 1:
+            result.append(((east ^ (3 << (gap - 1))) << shift) | (gap - 1))
+        if gap > 1 and (east >> (gap - 2)) & 1:
+            result.append(((east ^ (5 << (gap - 2))) << shift) | (gap - 2))
+        if gap < self.size - 1 and not (east >> (gap + 1)) & 1:
+            result.append((east << shift) | (gap + 1))
+        if gap < self.size - 2 and not (east >> (gap + 2)) & 1:
+            result.append((east << shift) | (gap + 2))
+        return result
+
+    def predecessors(self, packed):
+        # Undo a move: an E right of the gap came from the gap, a W left of it likewise.
+        east = packed >> self.shift
+        gap = packed & self.gap_mask
+        shift = self.shift
+        result = []
+        if gap < self.size - 1 and (east >> (gap + 1)) & 1:
+            result.append(((east ^ (3 << gap)) << shift) | (gap + 1))
+        if gap < self.size - 2 and (east >> (gap + 2)) & 1:
+            result.append(((east ^ (5 << gap)) << shift) | (gap + 2))
+        if gap > 0 and not (east >> (gap - 1)) & 1:
+            result.append((east << shift) | (gap - 1))
+        if gap > 1 and not (east >> (gap - 2)) & 1:
+            result.append((east << shift) | (gap - 2))
+        return result
+
+    def move_between(self, packed, next_packed):
+        # The rabbit moves from the new gap position into the old one.
+        gap = packed & self.gap_mask
+        src = next_packed & self.gap_mask
+        piece = 'E' if ((packed >> self.shift) >> src) & 1 else 'W'
+        return f"{piece} at {src} to {gap}"
+
+def _join_paths(parents, children, meet):
+    path = []
+    node = meet
+    while node is not None:
+        path.append(node)
+        node = parents[node]
+    path.reverse()
+    node = children[meet]
+    while node is not None:
+        path.append(node)
+        node = children[node]
+    return path
+
+def bidirectional_bfs_rabbit_leap(n=3):
+    board = RabbitLeapBoard(n)
+    start = board.pack(make_initial_state(n))
+    goal = board.pack(make_goal_state(n))
+    if start == goal:
+        return []
+    # parents[s] is the state before s on the start side, children[s] the state
+    # after s on the goal side; paths are only rebuilt once the searches meet.
+    parents = {start: None}
+    children = {goal: None}
+    front = [start]
+    back = [goal]
+    meet = None
+    while front and back and meet is None:
+        if len(front) <= len(back):
+            next_front = []
+            for state in front:
+                for nxt in board.successors(state):
+                    if nxt in parents:
+                        continue
+                    parents[nxt] = state
+                    if nxt in children:
+                        meet = nxt
+                        break
+                    next_front.append(nxt)
+                if meet is not None:
+                    break
+            front = next_front
+        else:
+            next_back = []
+            for state in back:
+                for prev in board.predecessors(state):
+                    if prev in children:
+                        continue
+                    children[prev] = state
+                    if prev in parents:
+                        meet = prev
+                        break
+                    next_back.append(prev)
+                if meet is not None:
+                    break
+            back = next_back
+    if meet is None:
+        return None
+    path = _join_paths(parents, children, meet)
+    return [board.move_between(a, b) for a, b in zip(path, path[1:])]
+
+def print_solution(n=3):
+    solution = bidirectional_bfs_rabbit_leap(n)
+    if solution:
+        print("Bidirectional BFS Solution found in", len(solution), "steps:")
+        state = make_initial_state(n)
+        print("Initial state:", ''.join(state))
+        for i, ((idx_from, idx_to, piece), state) in enumerate(iter_states(state, iter_moves(solution)), 1):
+            print(f"Step {i}: {piece} at {idx_from} to {idx_to} -> State: {''.join(state)}")
+    else:
+        print("No solution found with bidirectional BFS.")
+
+if __name__ == "__main__":
+    print_solution()
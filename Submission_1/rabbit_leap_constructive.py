@@ -0,0 +1,62 @@
+import sys
+from itertools import chain, repeat
+from rabbit_leap_bfs import bfs_rabbit_leap, make_initial_state, make_goal_state, iter_moves, iter_states
+
+def _move_groups(n):
+    # The optimal solution is runs of one colour of sizes 1..n, n, n..1, with
+    # colours alternating from E. Runs while the rabbits interleave end with a
+    # slide, runs while they separate start with one, the middle run only jumps.
+    rising = ((size, 'last') for size in range(1, n + 1))
+    falling = ((size, 'first') for size in range(n, 0, -1))
+    return chain(rising, repeat((n, None), 1), falling)
+
+def constructive_moves(n):
+    # Only the gap position is tracked, so any n streams in constant memory.
+    gap = n
+    piece = 'E'
+    for size, slide_at in _move_groups(n):
+        for k in range(size):
+            is_slide = (slide_at == 'first' and k == 0) or (slide_at == 'last' and k == size - 1)
+            step = 1 if is_slide else 2
+            idx_from = gap - step if piece == 'E' else gap + step
+            yield idx_from, gap, piece
+            gap = idx_from
+        piece = 'W' if piece == 'E' else 'E'
+
+def write_solution(n, path):
+    count = 0
+    with open(path, 'w') as f:
+        for idx_from, idx_to, piece in constructive_moves(n):
+            f.write(f"{piece} at {idx_from} to {idx_to}\n")
+            count += 1
+    return count
+
+def is_valid_solution(n, moves):
+    state = make_initial_state(n)
+    for (idx_from, idx_to, piece), state in iter_states(state, moves):
+        if state[idx_to] != piece or state[idx_from] != '_' or abs(idx_to - idx_from) > 2:
+            return False
+        if (piece == 'E') != (idx_from < idx_to):
+            return False
+    return state == make_goal_state(n)
+
+def cross_check(max_n=6):
+    for n in range(1, max_n + 1):
+        bfs_moves = list(iter_moves(bfs_rabbit_leap(n)))
+        built_moves = list(constructive_moves(n))
+        if len(built_moves) != len(bfs_moves) or not is_valid_solution(n, built_moves):
+            raise AssertionError(f"Constructive solution disagrees with BFS for n={n}")
+    return True
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        n = int(sys.argv[1])
+        count = write_solution(n, sys.argv[2])
+        print(f"Wrote {count} moves for n={n} to {sys.argv[2]}")
+    else:
+        cross_check()
+        print("Constructive solver matches BFS for n=1..6")
+        state = make_initial_state(3)
+        print("Initial state:", ''.join(state))
+        for i, ((idx_from, idx_to, piece), state) in enumerate(iter_states(state, constructive_moves(3)), 1):
+            print(f"Step {i}: {piece} at {idx_from} to {idx_to} -> State: {''.join(state)}")
@@ -1,3 +1,5 @@
+from rabbit_leap_bfs import iter_moves, iter_states
+
 def get_successors(state):
     successors = []
     empty_idx = state.index('_')
@@ -31,11 +33,97 @@ def dfs_rabbit_leap(state, goal_state, path, visited, depth_limit=100):
     visited.add(state_tuple)
     
     for next_state, move in get_successors(state):
-        result = dfs_rabbit_leap(next_state, goal_state, path + [move], visited)
+        result = dfs_rabbit_leap(next_state, goal_state, path + [move], visited, depth_limit)
         if result:
             return result
     return None
 
+def _legal_sources(state, empty_idx):
+    # Cells whose rabbit may move into the gap, in get_successors order.
+    sources = []
+    for idx in (empty_idx - 1, empty_idx - 2, empty_idx + 1, empty_idx + 2):
+        if 0 <= idx < len(state):
+            if (state[idx] == 'E' and idx < empty_idx) or (state[idx] == 'W' and idx > empty_idx):
+                sources.append(idx)
+    return sources
+
+def _depth_limited_search(initial_state, goal_state, depth_limit, visited, revisit_shallower, stats):
+    # The board and the path are single buffers that are mutated and undone in
+    # place; the explicit stack holds the untried sources of every open level.
+    state = list(initial_state)
+    if state == goal_state:
+        return []
+    empty_idx = state.index('_')
+    path = []
+    visited[tuple(state)] = 0
+    stats['nodes_expanded'] += 1
+    first = _legal_sources(state, empty_idx)
+    first.reverse()
+    stack = [first]
+    pending = len(first)
+    stats['peak_frontier'] = max(stats['peak_frontier'], pending)
+    while stack:
+        sources = stack[-1]
+        if not sources:
+            stack.pop()
+            if path:
+                piece, src, dst = path.pop()
+                state[src], state[dst] = piece, '_'
+                empty_idx = dst
+            continue
+        src = sources.pop()
+        pending -= 1
+        piece = state[src]
+        state[empty_idx], state[src] = piece, '_'
+        path.append((piece, src, empty_idx))
+        empty_idx = src
+        if state == goal_state:
+            return [f"{piece} at {src} to {dst}" for piece, src, dst in path]
+        depth = len(path)
+        state_tuple = tuple(state)
+        seen_depth = visited.get(state_tuple)
+        pruned = seen_depth is not None and (not revisit_shallower or seen_depth <= depth)
+        if pruned or depth >= depth_limit:
+            piece, src, dst = path.pop()
+            state[src], state[dst] = piece, '_'
+            empty_idx = dst
+            continue
+        visited[state_tuple] = depth
+        stats['nodes_expanded'] += 1
+        sources = _legal_sources(state, empty_idx)
+        sources.reverse()
+        stack.append(sources)
+        pending += len(sources)
+        stats['peak_frontier'] = max(stats['peak_frontier'], pending)
+    return None
+
+def _new_stats(stats):
+    if stats is None:
+        stats = {}
+    stats.update(nodes_expanded=0, peak_frontier=0, peak_visited=0, iterations=0)
+    return stats
+
+def iterative_dfs_rabbit_leap(initial_state, goal_state, depth_limit=100, stats=None):
+    stats = _new_stats(stats)
+    visited = {}
+    stats['iterations'] = 1
+    result = _depth_limited_search(initial_state, goal_state, depth_limit, visited, False, stats)
+    stats['peak_visited'] = len(visited)
+    return result
+
+def iddfs_rabbit_leap(initial_state, goal_state, depth_limit=100, stats=None):
+    # Visited depths are kept per iteration so a state first reached along a
+    # long branch can still be expanded when a shorter route turns up.
+    stats = _new_stats(stats)
+    for limit in range(depth_limit + 1):
+        visited = {}
+        stats['iterations'] += 1
+        result = _depth_limited_search(initial_state, goal_state, limit, visited, True, stats)
+        stats['peak_visited'] = max(stats['peak_visited'], len(visited))
+        if result is not None:
+            return result
+    return None
+
 def print_solution():
     initial_state = ['E', 'E', 'E', '_', 'W', 'W', 'W']
     goal_state = ['W', 'W', 'W', '_', 'E', 'E', 'E']
@@ -44,13 +132,10 @@ def print_solution():
         print("DFS Solution found in", len(solution), "steps:")
         state = initial_state.copy()
         print("Initial state:", ''.join(state))
-        for i, move in enumerate(solution, 1):
-            print(f"Step {i}: {move} -> State: ", end='')
-            idx_from = int(move.split(' at ')[1].split(' to ')[0])
-            idx_to = int(move.split(' to ')[1])
-            state[idx_from], state[idx_to] = state[idx_to], state[idx_from]
-            print(''.join(state))
+        for i, ((idx_from, idx_to, piece), state) in enumerate(iter_states(state, iter_moves(solution)), 1):
+            print(f"Step {i}: {piece} at {idx_from} to {idx_to} -> State: {''.join(state)}")
     else:
         print("No solution found with DFS.")
 
-print_solution()
\ No newline at end of file
+if __name__ == "__main__":
+    print_solution()
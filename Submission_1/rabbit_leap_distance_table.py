@@ -0,0 +1,129 @@
+import struct
+import sys
+from array import array
+from collections import deque
+from rabbit_leap_bfs import make_initial_state, make_goal_state
+from rabbit_leap_bidirectional import RabbitLeapBoard
+
+UNREACHABLE = 255
+HEADER = struct.Struct('<4sI')
+MAGIC = b'RLDT'
+
+def binomial_table(size):
+    table = [[0] * (size + 1) for _ in range(size + 1)]
+    for a in range(size + 1):
+        table[a][0] = 1
+        for b in range(1, a + 1):
+            table[a][b] = table[a - 1][b - 1] + table[a - 1][b]
+    return table
+
+class DistanceTable:
+    # distances[rank(state)] is the number of moves left to the goal. A state is
+    # ranked by its gap index and the colex rank of the east rabbits among the
+    # other 2n cells, so ids cover every arrangement of n E, n W and one gap.
+    def __init__(self, n, distances):
+        self.n = n
+        self.board = RabbitLeapBoard(n)
+        self.binomial = binomial_table(2 * n)
+        self.block = self.binomial[2 * n][n]
+        if len(distances) != self.board.size * self.block:
+            raise ValueError(f"Expected {self.board.size * self.block} entries, got {len(distances)}")
+        self.distances = distances
+
+    @classmethod
+    def build(cls, n):
+        if n * n + 2 * n >= UNREACHABLE:
+            raise ValueError(f"n={n} needs distances above {UNREACHABLE - 1}")
+        size = (2 * n + 1) * binomial_table(2 * n)[2 * n][n]
+        table = cls(n, array('B', [UNREACHABLE]) * size)
+        board = table.board
+        goal = board.pack(make_goal_state(n))
+        table.distances[table.rank(goal)] = 0
+        queue = deque([goal])
+        while queue:
+            state = queue.popleft()
+            next_dist = table.distances[table.rank(state)] + 1
+            for prev in board.predecessors(state):
+                prev_rank = table.rank(prev)
+                if table.distances[prev_rank] == UNREACHABLE:
+                    table.distances[prev_rank] = next_dist
+                    queue.append(prev)
+        return table
+
+    def rank(self, packed):
+        board = self.board
+        east = packed >> board.shift
+        gap = packed & board.gap_mask
+        binomial = self.binomial
+        rank = 0
+        k = 0
+        while east:
+            low = east & -east
+            idx = low.bit_length() - 1
+            k += 1
+            rank += binomial[idx if idx < gap else idx - 1][k]
+            east ^= low
+        return gap * self.block + rank
+
+    def _pack(self, state):
+        return state if isinstance(state, int) else self.board.pack(state)
+
+    def distance(self, state):
+        dist = self.distances[self.rank(self._pack(state))]
+        return None if dist == UNREACHABLE else dist
+
+    def solve_from(self, state):
+        packed = self._pack(state)
+        dist = self.distances[self.rank(packed)]
+        if dist == UNREACHABLE:
+            return None
+        moves = []
+        while dist > 0:
+            for nxt in self.board.successors(packed):
+                if self.distances[self.rank(nxt)] == dist - 1:
+                    moves.append(self.board.move_between(packed, nxt))
+                    packed = nxt
+                    dist -= 1
+                    break
+        return moves
+
+    def remaining_after(self, moves, state=None):
+        # Replays move strings in get_successors format and returns the optimal
+        # number of moves left after each one (None once the goal is unreachable).
+        packed = self._pack(make_initial_state(self.n) if state is None else state)
+        remaining = []
+        for step, move in enumerate(moves, 1):
+            for nxt in self.board.successors(packed):
+                if self.board.move_between(packed, nxt) == move:
+                    packed = nxt
+                    break
+            else:
+                raise ValueError(f"Illegal move at step {step}: {move}")
+            remaining.append(self.distance(packed))
+        return remaining
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, self.n))
+            self.distances.tofile(f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            magic, n = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a rabbit leap distance table")
+            size = (2 * n + 1) * binomial_table(2 * n)[2 * n][n]
+            distances = array('B')
+            distances.fromfile(f, size)
+        return cls(n, distances)
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    path = sys.argv[2] if len(sys.argv) > 2 else f"rabbit_leap_n{n}.dist"
+    table = DistanceTable.build(n)
+    table.save(path)
+    reachable = sum(1 for d in table.distances if d != UNREACHABLE)
+    print(f"Saved {len(table.distances)} entries ({reachable} reachable) to {path}")
+    start = make_initial_state(n)
+    print("Optimal moves from", ''.join(start) + ":", DistanceTable.load(path).distance(start))
@@ -0,0 +1,121 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from itertools import combinations
+from multiprocessing import Pool
+from plagiarism_detector import detect_plagiarism
+
+_worker_texts = {}
+_worker_options = {}
+
+def _init_worker(paths, options):
+    # Each worker reads the documents once instead of receiving them per task.
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            _worker_texts[os.path.basename(path)] = f.read()
+    _worker_options.update(options)
+
+def _compare_pair(pair):
+    doc1, doc2 = pair
+    start = time.perf_counter()
+    result = detect_plagiarism(_worker_texts[doc1], _worker_texts[doc2],
+                               _worker_options['threshold'], engine=_worker_options['engine'])
+    record = {
+        'doc1': doc1,
+        'doc2': doc2,
+        'total_cost': result['total_cost'],
+        'suspicious_pairs': result['suspicious_pairs'],
+        'seconds': round(time.perf_counter() - start, 6)
+    }
+    if _worker_options['include_alignment']:
+        record['alignment'] = result['alignment']
+    return record
+
+def completed_pairs(output_path):
+    # Pairs already written by an earlier run; a line cut off by an interrupt is ignored.
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding='utf-8') as f:
+        for line in f:
+            # Only whole lines count: a cut-off last line is truncated before appending.
+            if not line.endswith('\n'):
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            done.add((record['doc1'], record['doc2']))
+    return done
+
+def _truncate_partial_line(output_path, block_size=4096):
+    # Drops a last line cut off by an interrupt, reading back from the end
+    # only as far as the previous newline.
+    if not os.path.exists(output_path):
+        return
+    with open(output_path, 'rb+') as f:
+        end = pos = f.seek(0, os.SEEK_END)
+        while pos > 0:
+            start = max(0, pos - block_size)
+            f.seek(start)
+            block = f.read(pos - start)
+            if pos == end and block.endswith(b'\n'):
+                return
+            newline = block.rfind(b'\n')
+            if newline >= 0:
+                f.truncate(start + newline + 1)
+                return
+            pos = start
+        f.truncate(0)
+
+def run_batch(directory, output_path, workers=None, chunksize=16, threshold=10, engine='astar',
+              pattern='*.txt', include_alignment=False, progress_every=1.0, log=sys.stderr):
+    paths = sorted(glob.glob(os.path.join(directory, pattern)))
+    names = [os.path.basename(path) for path in paths]
+    done = completed_pairs(output_path)
+    pending = [pair for pair in combinations(names, 2) if pair not in done]
+    stats = {'documents': len(names), 'skipped': len(done), 'compared': 0, 'flagged': 0}
+    if not pending:
+        return stats
+
+    _truncate_partial_line(output_path)
+    options = {'threshold': threshold, 'engine': engine, 'include_alignment': include_alignment}
+    start = last_report = time.perf_counter()
+    with open(output_path, 'a', encoding='utf-8') as out, \
+            Pool(workers, initializer=_init_worker, initargs=(paths, options)) as pool:
+        for record in pool.imap_unordered(_compare_pair, pending, chunksize):
+            out.write(json.dumps(record) + '\n')
+            out.flush()
+            stats['compared'] += 1
+            if record['suspicious_pairs']:
+                stats['flagged'] += 1
+            now = time.perf_counter()
+            if log is not None and (now - last_report >= progress_every or stats['compared'] == len(pending)):
+                rate = stats['compared'] / (now - start)
+                print(f"{stats['compared']}/{len(pending)} pairs, {rate:.1f} pairs/s, "
+                      f"{stats['flagged']} flagged", file=log)
+                last_report = now
+    stats['seconds'] = time.perf_counter() - start
+    stats['pairs_per_second'] = stats['compared'] / stats['seconds']
+    return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare every pair of documents in a directory.")
+    parser.add_argument('directory')
+    parser.add_argument('-o', '--output', default='plagiarism_results.jsonl')
+    parser.add_argument('-j', '--workers', type=int, default=None)
+    parser.add_argument('--chunksize', type=int, default=16)
+    parser.add_argument('--threshold', type=int, default=10)
+    parser.add_argument('--engine', choices=['astar', 'hirschberg'], default='astar')
+    parser.add_argument('--pattern', default='*.txt')
+    parser.add_argument('--with-alignment', action='store_true')
+    args = parser.parse_args(argv)
+    stats = run_batch(args.directory, args.output, args.workers, args.chunksize, args.threshold,
+                      args.engine, args.pattern, args.with_alignment)
+    print(json.dumps(stats))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import random
+import sys
+import time
+import tracemalloc
+from plagiarism_detector import a_star_alignment, hirschberg_alignment, SentenceDistanceCache
+
+WORDS = ("the quick brown fox jumps over a lazy dog while students copy their homework "
+         "from each other before the deadline and hope nobody notices").split()
+
+def random_sentence(rng):
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(4, 12))) + '.'
+
+def make_pair(kind, size, rng):
+    doc1 = [random_sentence(rng) for _ in range(size)]
+    if kind == 'near-duplicate':
+        doc2 = [random_sentence(rng) if rng.random() < 0.05 else s for s in doc1]
+    elif kind == 'reordered':
+        half = size // 2
+        doc2 = doc1[half:] + doc1[:half]
+    elif kind == 'unrelated':
+        doc2 = [random_sentence(rng) for _ in range(size)]
+    else:
+        raise ValueError(f"Unknown pair kind: {kind}")
+    return doc1, doc2
+
+def measure(engine, doc1, doc2):
+    tracemalloc.start()
+    start = time.perf_counter()
+    _, cost = engine(doc1, doc2)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return cost, elapsed, peak
+
+def run_benchmark(sizes=(25, 50, 100, 200), seed=0):
+    # The cached variant shows how much of Hirschberg's time is recomputing
+    # the same sentence pairs at every level of the recursion.
+    engines = [('astar', a_star_alignment),
+               ('hirschberg', hirschberg_alignment),
+               ('hirschberg+c', lambda d1, d2: hirschberg_alignment(d1, d2, SentenceDistanceCache()))]
+    print(f"{'case':>15} {'size':>5} {'engine':>12} {'time (s)':>9} {'peak (KB)':>10} {'cost':>7}")
+    for kind in ('near-duplicate', 'reordered', 'unrelated'):
+        for size in sizes:
+            doc1, doc2 = make_pair(kind, size, random.Random(seed + size))
+            costs = set()
+            for name, engine in engines:
+                cost, elapsed, peak = measure(engine, doc1, doc2)
+                costs.add(cost)
+                print(f"{kind:>15} {size:>5} {name:>12} {elapsed:>9.3f} {peak / 1024:>10.1f} {cost:>7}")
+            assert len(costs) == 1, f"Engines disagree on {kind} size {size}: {costs}"
+
+if __name__ == "__main__":
+    sizes = tuple(int(arg) for arg in sys.argv[1:]) or (25, 50, 100, 200)
+    run_benchmark(sizes)
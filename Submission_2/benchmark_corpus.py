@@ -0,0 +1,58 @@
+import random
+import sys
+import time
+from plagiarism_detector import detect_plagiarism
+from plagiarism_corpus import build_index, detect_plagiarism_corpus
+
+def make_vocabulary(rng, size=5000):
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    return [''.join(rng.choice(letters) for _ in range(rng.randint(2, 9))) for _ in range(size)]
+
+def make_corpus(num_docs, rng, sentences_per_doc=12, copy_rate=0.05, copied_sentences=4):
+    vocabulary = make_vocabulary(rng)
+    def sentence():
+        return ' '.join(rng.choice(vocabulary) for _ in range(rng.randint(8, 14))) + '.'
+    docs = [[sentence() for _ in range(sentences_per_doc)] for _ in range(num_docs)]
+    planted = set()
+    for target in rng.sample(range(num_docs), int(num_docs * copy_rate)):
+        source = rng.randrange(num_docs)
+        if source == target:
+            continue
+        for idx in rng.sample(range(sentences_per_doc), copied_sentences):
+            words = docs[source][idx].split()
+            words[rng.randrange(len(words))] = rng.choice(vocabulary)
+            docs[target][rng.randrange(sentences_per_doc)] = ' '.join(words)
+        planted.add((min(source, target), max(source, target)))
+    return [' '.join(doc) for doc in docs], planted
+
+def run_benchmark(num_docs=2000, seed=0, sample_size=200):
+    rng = random.Random(seed)
+    texts, planted = make_corpus(num_docs, rng)
+    total_pairs = num_docs * (num_docs - 1) // 2
+
+    start = time.perf_counter()
+    candidates = build_index(texts).candidate_pairs()
+    index_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = detect_plagiarism_corpus(texts)
+    shortlist_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(sample_size):
+        a, b = rng.sample(range(num_docs), 2)
+        detect_plagiarism(texts[a], texts[b])
+    per_pair = (time.perf_counter() - start) / sample_size
+
+    found = sum(1 for pair in planted if pair in candidates)
+    print(f"Documents:              {num_docs}")
+    print(f"All pairs:              {total_pairs}")
+    print(f"Shortlisted pairs:      {len(candidates)} ({len(candidates) / total_pairs:.4%})")
+    print(f"Planted pairs found:    {found}/{len(planted)}")
+    print(f"Index + LSH time:       {index_time:.2f} s")
+    print(f"Shortlist mode total:   {shortlist_time:.2f} s ({len(results)} alignments)")
+    print(f"All-pairs A* estimate:  {per_pair * total_pairs:.0f} s ({per_pair * 1000:.1f} ms per pair)")
+
+if __name__ == "__main__":
+    num_docs = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    run_benchmark(num_docs)
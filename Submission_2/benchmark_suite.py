@@ -0,0 +1,119 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from plagiarism_detector import detect_plagiarism
+from synthetic_documents import make_document_pair
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+# name: (edit_rate, reorder_rate, largest size to run). A* degrades towards
+# the full quadratic table once sentences move, so reordered pairs stop early.
+PROFILES = {
+    'exact': (0.0, 0.0, None),
+    'light-edit': (0.1, 0.0, None),
+    'heavy-edit': (0.3, 0.0, None),
+    'reordered': (0.1, 0.01, 1000),
+}
+QUICK_SIZES = (10, 100, 1000)
+FULL_SIZES = (10, 100, 1000, 10000)
+
+# Counters and costs are deterministic for a seed, so any change is reported;
+# time and memory only count as regressions beyond the tolerance, and time
+# also has to grow by MIN_SECONDS so millisecond cases do not flag noise.
+EXACT_FIELDS = ('total_cost', 'nodes_expanded', 'levenshtein_calls')
+MEASURED_FIELDS = ('seconds', 'peak_kb')
+MIN_SECONDS = 0.05
+
+def make_cases(sizes=QUICK_SIZES, profiles=None, engine='astar', seed=0):
+    cases = []
+    for name in profiles or PROFILES:
+        edit_rate, reorder_rate, max_size = PROFILES[name]
+        for size in sizes:
+            if max_size is None or size <= max_size:
+                cases.append({'case': f"{engine}/{name}/{size}", 'engine': engine, 'size': size,
+                              'edit_rate': edit_rate, 'reorder_rate': reorder_rate, 'seed': seed + size})
+    return cases
+
+def run_case(case, repeat=1):
+    text1, text2 = make_document_pair(case['size'], case['edit_rate'], case['reorder_rate'], seed=case['seed'])
+    seconds = float('inf')
+    for _ in range(repeat):
+        stats = {}
+        start = time.perf_counter()
+        result = detect_plagiarism(text1, text2, engine=case['engine'], stats=stats)
+        seconds = min(seconds, time.perf_counter() - start)
+    # Peak memory comes from a separate traced run so tracing does not skew the timing.
+    tracemalloc.start()
+    detect_plagiarism(text1, text2, engine=case['engine'])
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return dict(case,
+                seconds=round(seconds, 6),
+                peak_kb=round(peak / 1024, 1),
+                nodes_expanded=stats.get('nodes_expanded'),
+                levenshtein_calls=stats['levenshtein_calls'],
+                total_cost=result['total_cost'],
+                suspicious_pairs=len(result['suspicious_pairs']))
+
+def run_suite(cases, repeat=1, log=sys.stdout):
+    results = []
+    for case in cases:
+        record = run_case(case, repeat)
+        results.append(record)
+        if log is not None:
+            print(f"{record['case']:>24} {record['seconds']:>9.3f} s {record['peak_kb']:>10.1f} KB "
+                  f"{str(record['nodes_expanded']):>9} nodes {record['levenshtein_calls']:>8} lev calls",
+                  file=log)
+    return {'python': platform.python_version(), 'machine': platform.machine(), 'results': results}
+
+def compare_to_baseline(report, baseline, tolerance=0.25, min_seconds=MIN_SECONDS):
+    # Returns human readable problems; cases missing from the baseline are skipped.
+    previous = {record['case']: record for record in baseline['results']}
+    problems = []
+    for record in report['results']:
+        old = previous.get(record['case'])
+        if old is None:
+            continue
+        for field in EXACT_FIELDS:
+            if record[field] != old[field]:
+                problems.append(f"{record['case']}: {field} changed {old[field]} -> {record[field]}")
+        floors = {'seconds': min_seconds}
+        for field in MEASURED_FIELDS:
+            if record[field] > old[field] * (1 + tolerance) and record[field] - old[field] > floors.get(field, 0):
+                problems.append(f"{record['case']}: {field} regressed {old[field]} -> {record[field]}")
+    return problems
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scaling benchmark for detect_plagiarism.")
+    parser.add_argument('--full', action='store_true', help="include 10,000-sentence documents")
+    parser.add_argument('--sizes', type=int, nargs='+')
+    parser.add_argument('--profiles', nargs='+', choices=sorted(PROFILES))
+    parser.add_argument('--engine', choices=['astar', 'hirschberg'], default='astar')
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--write-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--min-seconds', type=float, default=MIN_SECONDS,
+                        help="smallest slowdown in seconds reported as a regression")
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes or (FULL_SIZES if args.full else QUICK_SIZES)
+    report = run_suite(make_cases(sizes, args.profiles, args.engine), args.repeat)
+    if args.write_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=1)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    with open(args.baseline, encoding='utf-8') as f:
+        problems = compare_to_baseline(report, json.load(f), args.tolerance, args.min_seconds)
+    for problem in problems:
+        print(problem)
+    print(f"{len(problems)} differences from {args.baseline}")
+    return 1 if problems else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
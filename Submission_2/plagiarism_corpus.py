@@ -0,0 +1,116 @@
+import random
+import zlib
+from collections import defaultdict
+from plagiarism_detector import preprocess_text, detect_plagiarism, bounded_levenshtein
+
+MERSENNE_PRIME = (1 << 61) - 1
+
+def sentence_shingles(sentence, size=3):
+    # Word k-shingles hashed with crc32 so they are stable across runs;
+    # sentences shorter than `size` words become a single shingle.
+    words = sentence.split()
+    if len(words) <= size:
+        return {zlib.crc32(' '.join(words).encode('utf-8'))}
+    return {zlib.crc32(' '.join(words[k:k + size]).encode('utf-8'))
+            for k in range(len(words) - size + 1)}
+
+class MinHashLSH:
+    # MinHash signatures of sentence shingles, split into bands. Two sentences
+    # land in the same bucket of some band with probability 1 - (1 - J^r)^b for
+    # Jaccard similarity J, so only near-duplicates tend to collide.
+    def __init__(self, num_perm=32, bands=16, shingle_size=3, max_bucket_size=100, seed=1):
+        if num_perm % bands:
+            raise ValueError(f"num_perm={num_perm} is not divisible by bands={bands}")
+        self.rows = num_perm // bands
+        self.bands = bands
+        self.shingle_size = shingle_size
+        # Buckets shared by more sentences than this are boilerplate rather
+        # than evidence of copying and are ignored when pairing.
+        self.max_bucket_size = max_bucket_size
+        rng = random.Random(seed)
+        self.permutations = [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(MERSENNE_PRIME))
+                             for _ in range(num_perm)]
+        self.buckets = defaultdict(list)
+        self.sentences = {}
+
+    def signature(self, sentence):
+        hashes = sentence_shingles(sentence, self.shingle_size)
+        return [min((a * h + b) % MERSENNE_PRIME for h in hashes) for a, b in self.permutations]
+
+    def add(self, doc_id, text):
+        sentences = preprocess_text(text)
+        self.sentences[doc_id] = sentences
+        for idx, sentence in enumerate(sentences):
+            signature = self.signature(sentence)
+            for band in range(self.bands):
+                key = (band, tuple(signature[band * self.rows:(band + 1) * self.rows]))
+                self.buckets[key].append((doc_id, idx))
+
+    def candidate_pairs(self):
+        # Maps each candidate (doc_a, doc_b) to the sentence pairs (idx_a, idx_b)
+        # that collided in at least one band.
+        pairs = defaultdict(set)
+        for members in self.buckets.values():
+            if len(members) < 2 or len(members) > self.max_bucket_size:
+                continue
+            for x in range(len(members)):
+                doc_a, idx_a = members[x]
+                for y in range(x + 1, len(members)):
+                    doc_b, idx_b = members[y]
+                    if doc_a == doc_b:
+                        continue
+                    if doc_b < doc_a:
+                        pairs[(doc_b, doc_a)].add((idx_b, idx_a))
+                    else:
+                        pairs[(doc_a, doc_b)].add((idx_a, idx_b))
+        return pairs
+
+def build_index(texts, **lsh_options):
+    index = MinHashLSH(**lsh_options)
+    items = texts.items() if isinstance(texts, dict) else enumerate(texts)
+    for doc_id, text in items:
+        index.add(doc_id, text)
+    return index
+
+def detect_plagiarism_corpus(texts, threshold=10, align=True, min_shared=1, cache=None, **lsh_options):
+    # Shortlists document pairs with MinHash/LSH and only runs exact work on
+    # them: a full alignment per pair, or with align=False just the bounded
+    # Levenshtein of each colliding sentence pair.
+    index = build_index(texts, **lsh_options)
+    results = {}
+    for (doc_a, doc_b), sentence_pairs in sorted(index.candidate_pairs().items()):
+        if len(sentence_pairs) < min_shared:
+            continue
+        if align:
+            result = detect_plagiarism(texts[doc_a], texts[doc_b], threshold, cache)
+        else:
+            s1 = index.sentences[doc_a]
+            s2 = index.sentences[doc_b]
+            suspicious_pairs = []
+            for idx1, idx2 in sorted(sentence_pairs):
+                if cache is not None:
+                    cost = cache.distance(s1[idx1], s2[idx2], threshold)
+                else:
+                    cost = bounded_levenshtein(s1[idx1], s2[idx2], threshold)
+                if cost <= threshold:
+                    suspicious_pairs.append({
+                        'doc1_idx': idx1,
+                        'doc2_idx': idx2,
+                        'doc1_sent': s1[idx1],
+                        'doc2_sent': s2[idx2],
+                        'cost': cost
+                    })
+            result = {'total_cost': None, 'alignment': None, 'suspicious_pairs': suspicious_pairs}
+        result['candidate_sentence_pairs'] = sorted(sentence_pairs)
+        results[(doc_a, doc_b)] = result
+    return results
+
+if __name__ == "__main__":
+    corpus = {
+        'alice': "The quick brown fox jumps over the lazy dog. It is a sunny day in the park.",
+        'bob': "It is a sunny day in the park. The fast brown fox leaps over the lazy dog.",
+        'carol': "Lorem ipsum dolor sit amet. Consectetur adipiscing elit sed do eiusmod."
+    }
+    for (doc_a, doc_b), result in detect_plagiarism_corpus(corpus).items():
+        print(f"{doc_a} vs {doc_b}: cost {result['total_cost']}, "
+              f"{len(result['suspicious_pairs'])} suspicious pairs")
@@ -1,5 +1,16 @@
+import hashlib
 import heapq
+import os
+import pickle
 import re
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NUMPY_MIN_BAND = 256
 
 def preprocess_text(text):
     # Split by sentence delimiters (., !, ?)
@@ -27,61 +38,391 @@ def levenshtein_distance(s1, s2):
     
     return previous_row[-1]
 
+def _banded_levenshtein(s1, s2, band):
+    # Ukkonen's cutoff: a cell more than `band` off the diagonal already costs
+    # more than `band`, so only |i - j| <= band is filled. Two rows are reused
+    # and cells outside the band read as `over`. Expects len(s1) >= len(s2).
+    over = band + 1
+    len2 = len(s2)
+    previous_row = [j if j <= band else over for j in range(len2 + 1)]
+    current_row = [over] * (len2 + 1)
+    for i, c1 in enumerate(s1, 1):
+        lo = max(1, i - band)
+        hi = min(len2, i + band)
+        current_row[lo - 1] = i if lo == 1 and i <= band else over
+        if hi < len2:
+            previous_row[hi + 1] = over
+        row_min = current_row[lo - 1]
+        for j in range(lo, hi + 1):
+            value = previous_row[j - 1] + (c1 != s2[j - 1])
+            insertion = previous_row[j] + 1
+            if insertion < value:
+                value = insertion
+            deletion = current_row[j - 1] + 1
+            if deletion < value:
+                value = deletion
+            current_row[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > band:
+            return over
+        previous_row, current_row = current_row, previous_row
+    return min(previous_row[len2], over)
+
+def _banded_levenshtein_numpy(s1, s2, band):
+    # Same band as above; the in-row deletion chain is a running minimum of
+    # (value - j) + j, so each row is a handful of vector operations.
+    over = band + 1
+    len2 = len(s2)
+    codes2 = np.frombuffer(s2.encode('utf-32-le'), dtype=np.uint32)
+    idx = np.arange(len2 + 1, dtype=np.int64)
+    previous_row = np.minimum(idx, over)
+    current_row = np.full(len2 + 1, over, dtype=np.int64)
+    for i, c1 in enumerate(s1, 1):
+        lo = max(1, i - band)
+        hi = min(len2, i + band)
+        current_row[lo - 1] = i if lo == 1 and i <= band else over
+        if hi < len2:
+            previous_row[hi + 1] = over
+        value = np.minimum(previous_row[lo - 1:hi] + (codes2[lo - 1:hi] != ord(c1)),
+                           previous_row[lo:hi + 1] + 1)
+        chain = np.concatenate(([current_row[lo - 1]], value)) - idx[lo - 1:hi + 1]
+        current_row[lo - 1:hi + 1] = np.minimum.accumulate(chain) + idx[lo - 1:hi + 1]
+        if current_row[lo - 1:hi + 1].min() > band:
+            return over
+        previous_row, current_row = current_row, previous_row
+    return int(min(previous_row[len2], over))
+
+def bounded_levenshtein(s1, s2, max_cost, use_numpy=None):
+    # Exact distance when it is <= max_cost, otherwise max_cost + 1. The band
+    # starts narrow and doubles, so near-duplicate sentences cost O(d * len).
+    if len(s1) < len(s2):
+        s1, s2 = s2, s1
+    if len(s1) - len(s2) > max_cost:
+        return max_cost + 1
+    if len(s2) == 0:
+        return len(s1)
+    limit = min(max_cost, len(s1))
+    band = max(len(s1) - len(s2), min(limit, 8))
+    while True:
+        band = min(band, limit)
+        if use_numpy is None:
+            vectorize = np is not None and band >= NUMPY_MIN_BAND
+        else:
+            vectorize = use_numpy and np is not None
+        if vectorize:
+            distance = _banded_levenshtein_numpy(s1, s2, band)
+        else:
+            distance = _banded_levenshtein(s1, s2, band)
+        if distance <= band:
+            return distance
+        if band >= limit:
+            return max_cost + 1
+        band *= 2
+
+class SentenceDistanceCache:
+    # LRU of pairwise sentence distances keyed by stable sentence digests, so
+    # entries survive pickling and are shared across alignments and runs. An
+    # entry is (value, limit): value <= limit is exact, otherwise the distance
+    # is only known to exceed limit.
+    def __init__(self, max_size=100000):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def sentence_key(sentence):
+        return hashlib.blake2b(sentence.encode('utf-8'), digest_size=16).digest()
+
+    def distance(self, s1, s2, max_cost):
+        k1 = self.sentence_key(s1)
+        k2 = self.sentence_key(s2)
+        key = (k1, k2) if k1 <= k2 else (k2, k1)
+        entry = self.entries.get(key)
+        if entry is not None:
+            value, limit = entry
+            if value <= limit:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return value if value <= max_cost else max_cost + 1
+            if max_cost <= limit:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return max_cost + 1
+        self.misses += 1
+        value = bounded_levenshtein(s1, s2, max_cost)
+        self.entries[key] = (value, max_cost)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return value
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self.entries),
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            pickle.dump({'max_size': self.max_size, 'entries': list(self.entries.items())}, f)
+
+    @classmethod
+    def load(cls, path, max_size=None):
+        if not os.path.exists(path):
+            return cls(max_size or 100000)
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+        cache = cls(max_size or data['max_size'])
+        for key, entry in data['entries'][-cache.max_size:]:
+            cache.entries[key] = entry
+        return cache
+
 def heuristic(i, j, doc1_sentences, doc2_sentences):
     remaining_doc1 = len(doc1_sentences) - i
     remaining_doc2 = len(doc2_sentences) - j
     return abs(remaining_doc1 - remaining_doc2)
 
-def a_star_alignment(doc1_sentences, doc2_sentences):    
-    start_state = (0, 0, 0, 0, []) # f, g, i, j, path
-    pq = [start_state]
-    visited = set()
-    
+def suffix_bounds(sentences):
+    # total[k] is the length of sentences[k:], shortest[k] its shortest sentence.
+    n = len(sentences)
+    total = [0] * (n + 1)
+    shortest = [0] * (n + 1)
+    for k in range(n - 1, -1, -1):
+        length = len(sentences[k])
+        total[k] = total[k + 1] + length
+        shortest[k] = length if k == n - 1 else min(length, shortest[k + 1])
+    return total, shortest
+
+def suffix_heuristic(i, j, bounds1, bounds2):
+    # Two admissible bounds on the remaining cost:
+    # - every surplus sentence of the longer suffix must be skipped, and a skip
+    #   costs at least the shortest sentence left in that suffix;
+    # - MATCH costs at least |len1 - len2| and a skip its whole length, so the
+    #   total is at least the difference in remaining characters.
+    total1, shortest1 = bounds1
+    total2, shortest2 = bounds2
+    surplus = (len(total1) - i) - (len(total2) - j)
+    if surplus > 0:
+        skips = surplus * shortest1[i]
+    elif surplus < 0:
+        skips = -surplus * shortest2[j]
+    else:
+        skips = 0
+    return max(skips, abs(total1[i] - total2[j]))
+
+def make_heuristic(name, doc1_sentences, doc2_sentences):
+    if name == 'count':
+        return lambda i, j: heuristic(i, j, doc1_sentences, doc2_sentences)
+    if name == 'suffix':
+        bounds1 = suffix_bounds(doc1_sentences)
+        bounds2 = suffix_bounds(doc2_sentences)
+        return lambda i, j: suffix_heuristic(i, j, bounds1, bounds2)
+    raise ValueError(f"Unknown heuristic: {name}")
+
+MATCH, SKIP1, SKIP2 = 0, 1, 2
+MOVE_NAMES = ('MATCH', 'SKIP1', 'SKIP2')
+
+def _reconstruct_alignment(best, width, goal):
+    # Walks the predecessor codes back from the goal; edge costs are the g
+    # differences between consecutive cells.
+    alignment = []
+    cell = goal
+    while cell != 0:
+        g, move = best[cell] >> 2, best[cell] & 3
+        i, j = divmod(cell, width)
+        if move == MATCH:
+            prev = cell - width - 1
+            item = (i - 1, j - 1)
+        elif move == SKIP1:
+            prev = cell - width
+            item = (i - 1, None)
+        else:
+            prev = cell - 1
+            item = (None, j - 1)
+        alignment.append(item + (g - (best[prev] >> 2), MOVE_NAMES[move]))
+        cell = prev
+    alignment.reverse()
+    return alignment
+
+def a_star_alignment(doc1_sentences, doc2_sentences, cache=None, heuristic_name='suffix', stats=None):
     rows = len(doc1_sentences)
     cols = len(doc2_sentences)
+    width = cols + 1
+    goal = rows * width + cols
+    # best maps the flat cell id i * width + j to (g << 2) | move, where move is
+    # how the cell was entered. Only reached cells get an entry and heap items
+    # are plain (f, g, i, j), so no partial paths are ever copied.
+    h = make_heuristic(heuristic_name, doc1_sentences, doc2_sentences)
+    if stats is None:
+        stats = {}
+    stats.update(nodes_expanded=0, nodes_pushed=1, levenshtein_calls=0)
+    best = {0: MATCH}
+    pq = [(h(0, 0), 0, 0, 0)]
     
     while pq:
-        f, g, i, j, path = heapq.heappop(pq)
+        f, g, i, j = heapq.heappop(pq)
+        cell = i * width + j
         
-        if (i, j) in visited:
+        # Stale entry: the cell was reached more cheaply after this push
+        if best[cell] >> 2 < g:
             continue
-        visited.add((i, j))
         
         # Goal state
-        if i == rows and j == cols:
-            return path, g
+        if cell == goal:
+            return _reconstruct_alignment(best, width, goal), g
+        stats['nodes_expanded'] += 1
             
         # Transitions        
         # 1. Match/Align current sentences
         if i < rows and j < cols:
-            cost = levenshtein_distance(doc1_sentences[i], doc2_sentences[j])
-            new_g = g + cost
-            new_h = heuristic(i + 1, j + 1, doc1_sentences, doc2_sentences)
-            new_path = path + [(i, j, cost, 'MATCH')]
-            heapq.heappush(pq, (new_g + new_h, new_g, i + 1, j + 1, new_path))            
+            next_cell = cell + width + 1
+            # Matching never needs to cost more than skipping both sentences,
+            # nor as much as the best route into the next cell found so far.
+            limit = len(doc1_sentences[i]) + len(doc2_sentences[j])
+            if next_cell in best:
+                limit = min(limit, (best[next_cell] >> 2) - g - 1)
+            if limit >= 0:
+                stats['levenshtein_calls'] += 1
+                if cache is not None:
+                    cost = cache.distance(doc1_sentences[i], doc2_sentences[j], limit)
+                else:
+                    cost = bounded_levenshtein(doc1_sentences[i], doc2_sentences[j], limit)
+                if cost <= limit:
+                    new_g = g + cost
+                    best[next_cell] = (new_g << 2) | MATCH
+                    new_h = h(i + 1, j + 1)
+                    heapq.heappush(pq, (new_g + new_h, new_g, i + 1, j + 1))
+                    stats['nodes_pushed'] += 1
         # 2. Skip sentence in doc1
         if i < rows:
-            cost = len(doc1_sentences[i]) 
-            new_g = g + cost
-            new_h = heuristic(i + 1, j, doc1_sentences, doc2_sentences)
-            new_path = path + [(i, None, cost, 'SKIP1')]
-            heapq.heappush(pq, (new_g + new_h, new_g, i + 1, j, new_path))            
+            next_cell = cell + width
+            new_g = g + len(doc1_sentences[i])
+            if next_cell not in best or new_g < best[next_cell] >> 2:
+                best[next_cell] = (new_g << 2) | SKIP1
+                new_h = h(i + 1, j)
+                heapq.heappush(pq, (new_g + new_h, new_g, i + 1, j))
+                stats['nodes_pushed'] += 1
         # 3. Skip sentence in doc2
         if j < cols:
-            cost = len(doc2_sentences[j])
-            new_g = g + cost
-            new_h = heuristic(i, j + 1, doc1_sentences, doc2_sentences)
-            new_path = path + [(None, j, cost, 'SKIP2')]
-            heapq.heappush(pq, (new_g + new_h, new_g, i, j + 1, new_path))
+            next_cell = cell + 1
+            new_g = g + len(doc2_sentences[j])
+            if next_cell not in best or new_g < best[next_cell] >> 2:
+                best[next_cell] = (new_g << 2) | SKIP2
+                new_h = h(i, j + 1)
+                heapq.heappush(pq, (new_g + new_h, new_g, i, j + 1))
+                stats['nodes_pushed'] += 1
             
     return [], float('inf')
 
-def detect_plagiarism(text1, text2, threshold=10):
+def _match_cost_function(cache):
+    if cache is not None:
+        return cache.distance
+    return bounded_levenshtein
+
+def _last_row(doc1_sentences, doc2_sentences, match_cost):
+    # Last DP row: cost of aligning all of doc1 with each prefix of doc2.
+    row = [0]
+    for s2 in doc2_sentences:
+        row.append(row[-1] + len(s2))
+    for s1 in doc1_sentences:
+        skip1 = len(s1)
+        new_row = [row[0] + skip1]
+        for j, s2 in enumerate(doc2_sentences):
+            # MATCH only matters if it beats both skips into this cell.
+            value = min(row[j + 1] + skip1, new_row[j] + len(s2))
+            limit = value - row[j] - 1
+            if limit >= 0:
+                cost = match_cost(s1, s2, limit)
+                if cost <= limit:
+                    value = row[j] + cost
+            new_row.append(value)
+        row = new_row
+    return row
+
+def _small_alignment(doc1_sentences, doc2_sentences, off1, off2, match_cost):
+    # Full table with traceback; only used when doc1 has at most one sentence.
+    rows = len(doc1_sentences)
+    cols = len(doc2_sentences)
+    table = [[0] * (cols + 1) for _ in range(rows + 1)]
+    moves = [[None] * (cols + 1) for _ in range(rows + 1)]
+    for i in range(rows + 1):
+        for j in range(cols + 1):
+            if i == 0 and j == 0:
+                continue
+            options = []
+            if i > 0 and j > 0:
+                # Levenshtein never exceeds the longer sentence, so this bound is exact.
+                s1, s2 = doc1_sentences[i - 1], doc2_sentences[j - 1]
+                cost = match_cost(s1, s2, len(s1) + len(s2))
+                options.append((table[i - 1][j - 1] + cost, MATCH, cost))
+            if i > 0:
+                cost = len(doc1_sentences[i - 1])
+                options.append((table[i - 1][j] + cost, SKIP1, cost))
+            if j > 0:
+                cost = len(doc2_sentences[j - 1])
+                options.append((table[i][j - 1] + cost, SKIP2, cost))
+            value, move, cost = min(options, key=lambda option: option[0])
+            table[i][j] = value
+            moves[i][j] = (move, cost)
+    alignment = []
+    i, j = rows, cols
+    while i > 0 or j > 0:
+        move, cost = moves[i][j]
+        if move == MATCH:
+            i, j = i - 1, j - 1
+            alignment.append((off1 + i, off2 + j, cost, 'MATCH'))
+        elif move == SKIP1:
+            i -= 1
+            alignment.append((off1 + i, None, cost, 'SKIP1'))
+        else:
+            j -= 1
+            alignment.append((None, off2 + j, cost, 'SKIP2'))
+    alignment.reverse()
+    return alignment
+
+def _hirschberg(doc1_sentences, doc2_sentences, off1, off2, match_cost, alignment):
+    if len(doc1_sentences) <= 1 or not doc2_sentences:
+        alignment.extend(_small_alignment(doc1_sentences, doc2_sentences, off1, off2, match_cost))
+        return
+    mid = len(doc1_sentences) // 2
+    forward = _last_row(doc1_sentences[:mid], doc2_sentences, match_cost)
+    backward = _last_row(doc1_sentences[mid:][::-1], doc2_sentences[::-1], match_cost)
+    cols = len(doc2_sentences)
+    split = min(range(cols + 1), key=lambda j: forward[j] + backward[cols - j])
+    _hirschberg(doc1_sentences[:mid], doc2_sentences[:split], off1, off2, match_cost, alignment)
+    _hirschberg(doc1_sentences[mid:], doc2_sentences[split:], off1 + mid, off2 + split, match_cost, alignment)
+
+def hirschberg_alignment(doc1_sentences, doc2_sentences, cache=None, stats=None):
+    # Exact DP over the same MATCH / SKIP1 / SKIP2 costs as a_star_alignment,
+    # in memory linear in the document lengths (Hirschberg divide and conquer).
+    alignment = []
+    match_cost = _match_cost_function(cache)
+    if stats is not None:
+        stats['levenshtein_calls'] = 0
+        inner = match_cost
+        def match_cost(s1, s2, limit):
+            stats['levenshtein_calls'] += 1
+            return inner(s1, s2, limit)
+    _hirschberg(doc1_sentences, doc2_sentences, 0, 0, match_cost, alignment)
+    return alignment, sum(item[2] for item in alignment)
+
+def compare_heuristics(text1, text2, names=('count', 'suffix')):
+    # Instrumentation: aligns once per heuristic and reports the search effort.
     s1 = preprocess_text(text1)
     s2 = preprocess_text(text2)
-    
-    alignment, total_cost = a_star_alignment(s1, s2)
-    
+    report = {}
+    for name in names:
+        stats = {}
+        _, total_cost = a_star_alignment(s1, s2, heuristic_name=name, stats=stats)
+        report[name] = dict(stats, total_cost=total_cost)
+    return report
+
+def find_suspicious_pairs(alignment, s1, s2, threshold=10):
     suspicious_pairs = []
     for item in alignment:
         idx1, idx2, cost, type_ = item
@@ -96,11 +437,100 @@ def detect_plagiarism(text1, text2, threshold=10):
                     'doc2_sent': s2[idx2],
                     'cost': cost
                 })
-                
+    return suspicious_pairs
+
+def detect_plagiarism(text1, text2, threshold=10, cache=None, engine='astar', stats=None):
+    s1 = preprocess_text(text1)
+    s2 = preprocess_text(text2)
+    
+    if engine == 'astar':
+        alignment, total_cost = a_star_alignment(s1, s2, cache, stats=stats)
+    elif engine == 'hirschberg':
+        alignment, total_cost = hirschberg_alignment(s1, s2, cache, stats)
+    else:
+        raise ValueError(f"Unknown alignment engine: {engine}")
+    
+    return {
+        'total_cost': total_cost,
+        'alignment': alignment,
+        'suspicious_pairs': find_suspicious_pairs(alignment, s1, s2, threshold)
+    }
+
+def _common_affixes(old_sentences, new_sentences):
+    limit = min(len(old_sentences), len(new_sentences))
+    prefix = 0
+    while prefix < limit and old_sentences[prefix] == new_sentences[prefix]:
+        prefix += 1
+    if prefix == len(old_sentences) == len(new_sentences):
+        # Unchanged document: every sentence is both leading and trailing.
+        return prefix, prefix
+    suffix = 0
+    while suffix < limit - prefix and old_sentences[-1 - suffix] == new_sentences[-1 - suffix]:
+        suffix += 1
+    return prefix, suffix
+
+def realign_incremental(old_doc1, new_doc1, old_doc2, new_doc2, previous_alignment, cache=None, margin=4):
+    # Keeps the leading and trailing steps of the previous alignment that only
+    # touch sentences outside the edited ranges and runs A* on the window of
+    # the grid between them. The kept prefix is still an optimal path to its
+    # end cell, but the result is only guaranteed optimal if the best new
+    # alignment passes through both window corners; `margin` extra steps on
+    # each side give the search room to leave the old path near the edit.
+    prefix1, suffix1 = _common_affixes(old_doc1, new_doc1)
+    prefix2, suffix2 = _common_affixes(old_doc2, new_doc2)
+
+    head = i0 = j0 = 0
+    for idx1, idx2, _, _ in previous_alignment:
+        if (idx1 is not None and idx1 >= prefix1) or (idx2 is not None and idx2 >= prefix2):
+            break
+        head += 1
+    head = max(0, head - margin)
+    for idx1, idx2, _, _ in previous_alignment[:head]:
+        i0 += idx1 is not None
+        j0 += idx2 is not None
+
+    tail = len(previous_alignment)
+    i1, j1 = len(old_doc1), len(old_doc2)
+    first_kept1, first_kept2 = len(old_doc1) - suffix1, len(old_doc2) - suffix2
+    while tail > head:
+        idx1, idx2, _, _ = previous_alignment[tail - 1]
+        if (idx1 is not None and idx1 < first_kept1) or (idx2 is not None and idx2 < first_kept2):
+            break
+        tail -= 1
+    tail = min(len(previous_alignment), tail + margin)
+    for idx1, idx2, _, _ in previous_alignment[tail:]:
+        i1 -= idx1 is not None
+        j1 -= idx2 is not None
+
+    shift1 = len(new_doc1) - len(old_doc1)
+    shift2 = len(new_doc2) - len(old_doc2)
+    window, _ = a_star_alignment(new_doc1[i0:i1 + shift1], new_doc2[j0:j1 + shift2], cache)
+
+    alignment = list(previous_alignment[:head])
+    for idx1, idx2, cost, move in window:
+        alignment.append((None if idx1 is None else idx1 + i0,
+                          None if idx2 is None else idx2 + j0, cost, move))
+    for idx1, idx2, cost, move in previous_alignment[tail:]:
+        alignment.append((None if idx1 is None else idx1 + shift1,
+                          None if idx2 is None else idx2 + shift2, cost, move))
+    return alignment, sum(item[2] for item in alignment), ((i0, i1 + shift1), (j0, j1 + shift2))
+
+def detect_plagiarism_incremental(previous_result, old_text1, new_text1, old_text2, new_text2=None,
+                                  threshold=10, cache=None):
+    # Same result format as detect_plagiarism, plus the recomputed window as
+    # ((doc1_start, doc1_end), (doc2_start, doc2_end)) in the new documents.
+    if new_text2 is None:
+        new_text2 = old_text2
+    new_s1 = preprocess_text(new_text1)
+    new_s2 = preprocess_text(new_text2)
+    alignment, total_cost, window = realign_incremental(
+        preprocess_text(old_text1), new_s1, preprocess_text(old_text2), new_s2,
+        previous_result['alignment'], cache)
     return {
         'total_cost': total_cost,
         'alignment': alignment,
-        'suspicious_pairs': suspicious_pairs
+        'suspicious_pairs': find_suspicious_pairs(alignment, new_s1, new_s2, threshold),
+        'window': window
     }
 
 if __name__ == "__main__":
@@ -109,4 +539,6 @@ if __name__ == "__main__":
     result = detect_plagiarism(t1, t2)
     print(f"Total Cost: {result['total_cost']}")
     for pair in result['suspicious_pairs']:
-        print(f"Suspicious: '{pair['doc1_sent']}' vs '{pair['doc2_sent']}' (Cost: {pair['cost']})")
\ No newline at end of file
+        print(f"Suspicious: '{pair['doc1_sent']}' vs '{pair['doc2_sent']}' (Cost: {pair['cost']})")
+    for name, report in compare_heuristics(t1, t2).items():
+        print(f"Heuristic {name}: {report['nodes_expanded']} nodes expanded, cost {report['total_cost']}")
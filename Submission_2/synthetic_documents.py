@@ -0,0 +1,58 @@
+import random
+
+LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+
+def make_vocabulary(rng, size=3000):
+    return [''.join(rng.choice(LETTERS) for _ in range(rng.randint(2, 9))) for _ in range(size)]
+
+def random_sentence(rng, vocabulary, min_words=6, max_words=14):
+    return ' '.join(rng.choice(vocabulary) for _ in range(rng.randint(min_words, max_words)))
+
+def edit_sentence(sentence, rng, vocabulary):
+    # One word-level edit: substitute, insert or delete a word.
+    words = sentence.split()
+    pos = rng.randrange(len(words))
+    kind = rng.random()
+    if kind < 0.5:
+        words[pos] = rng.choice(vocabulary)
+    elif kind < 0.75 or len(words) == 1:
+        words.insert(pos, rng.choice(vocabulary))
+    else:
+        del words[pos]
+    return ' '.join(words)
+
+def make_document_pair(num_sentences, edit_rate=0.1, reorder_rate=0.0, new_rate=0.0, seed=0):
+    # doc2 is a copy of doc1 where each sentence is edited with probability
+    # edit_rate, replaced by an unrelated one with probability new_rate, and a
+    # reorder_rate fraction of sentences is moved to random positions.
+    # Returns the two texts; the same arguments always give the same pair.
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(rng)
+    doc1 = [random_sentence(rng, vocabulary) for _ in range(num_sentences)]
+    doc2 = []
+    for sentence in doc1:
+        if rng.random() < new_rate:
+            doc2.append(random_sentence(rng, vocabulary))
+        elif rng.random() < edit_rate:
+            doc2.append(edit_sentence(sentence, rng, vocabulary))
+        else:
+            doc2.append(sentence)
+    # Any positive reorder_rate moves at least one sentence, so small documents are reordered too.
+    num_moved = int(num_sentences * reorder_rate)
+    if reorder_rate > 0 and num_sentences > 1:
+        num_moved = max(1, num_moved)
+    moved = rng.sample(range(num_sentences), num_moved)
+    moved_sentences = [doc2[idx] for idx in moved]
+    moved = set(moved)
+    doc2 = [sentence for idx, sentence in enumerate(doc2) if idx not in moved]
+    for sentence in moved_sentences:
+        doc2.insert(rng.randint(0, len(doc2)), sentence)
+    return to_text(doc1), to_text(doc2)
+
+def to_text(sentences):
+    return ' '.join(sentence.capitalize() + '.' for sentence in sentences)
+
+if __name__ == "__main__":
+    text1, text2 = make_document_pair(5, edit_rate=0.4, reorder_rate=0.2, seed=1)
+    print(text1)
+    print(text2)
@@ -1,5 +1,12 @@
 import unittest
-from plagiarism_detector import detect_plagiarism
+import json
+import os
+import tempfile
+from plagiarism_detector import (detect_plagiarism, levenshtein_distance, bounded_levenshtein,
+                                 SentenceDistanceCache, compare_heuristics, detect_plagiarism_incremental)
+from plagiarism_corpus import detect_plagiarism_corpus
+from synthetic_documents import make_document_pair
+from batch_plagiarism import run_batch, completed_pairs
 
 class TestPlagiarismDetector(unittest.TestCase):
 
@@ -39,5 +46,116 @@ class TestPlagiarismDetector(unittest.TestCase):
         print(f"Total Cost: {result['total_cost']}")
         self.assertTrue(len(result['suspicious_pairs']) >= 1)
 
+    def test_bounded_levenshtein(self):
+        print("\n Test Case 5: Bounded Levenshtein ")
+        s1 = "the quick brown fox jumps over the lazy dog"
+        s2 = "the fast brown fox leaps over the lazy dog"
+        exact = levenshtein_distance(s1, s2)
+        self.assertEqual(bounded_levenshtein(s1, s2, len(s1) + len(s2)), exact)
+        self.assertEqual(bounded_levenshtein(s1, s2, exact), exact)
+        self.assertEqual(bounded_levenshtein(s1, s2, exact - 1), exact)
+        self.assertEqual(bounded_levenshtein(s1, "", 5), 6)
+        self.assertEqual(bounded_levenshtein(s1, s2, len(s1), use_numpy=False), exact)
+
+    def test_distance_cache(self):
+        print("\n Test Case 6: Sentence Distance Cache ")
+        doc1 = "The quick brown fox jumps over the lazy dog. It is a sunny day."
+        doc2 = "The fast brown fox leaps over the lazy dog. It is a sunny day."
+        cache = SentenceDistanceCache(max_size=10)
+        first = detect_plagiarism(doc1, doc2, cache=cache)
+        misses = cache.stats()['misses']
+        second = detect_plagiarism(doc1, doc2, cache=cache)
+        print(f"Cache stats: {cache.stats()}")
+        self.assertEqual(first['total_cost'], detect_plagiarism(doc1, doc2)['total_cost'])
+        self.assertEqual(first['total_cost'], second['total_cost'])
+        self.assertEqual(cache.stats()['misses'], misses)
+        self.assertTrue(cache.stats()['hits'] > 0)
+        path = os.path.join(tempfile.mkdtemp(), 'distances.pkl')
+        cache.save(path)
+        self.assertEqual(SentenceDistanceCache.load(path).entries, cache.entries)
+
+    def test_heuristics_agree(self):
+        print("\n Test Case 7: Count vs Suffix Heuristic ")
+        doc1 = "The quick brown fox jumps over the lazy dog. It is a sunny day. Birds are singing."
+        doc2 = "It is a sunny day. The quick brown fox jumps over the lazy dog."
+        report = compare_heuristics(doc1, doc2)
+        print(f"Report: {report}")
+        self.assertEqual(report['count']['total_cost'], report['suffix']['total_cost'])
+        self.assertTrue(report['suffix']['nodes_expanded'] <= report['count']['nodes_expanded'])
+
+    def test_hirschberg_engine(self):
+        print("\n Test Case 8: Hirschberg Engine ")
+        doc1 = "The quick brown fox jumps over the lazy dog. It is a sunny day. Birds are singing."
+        doc2 = "It is a sunny day. The fast brown fox leaps over the lazy dog. Birds are singing."
+        astar = detect_plagiarism(doc1, doc2)
+        dp = detect_plagiarism(doc1, doc2, engine='hirschberg')
+        print(f"A* Cost: {astar['total_cost']}, Hirschberg Cost: {dp['total_cost']}")
+        self.assertEqual(astar['total_cost'], dp['total_cost'])
+        self.assertEqual(sum(item[2] for item in dp['alignment']), dp['total_cost'])
+
+    def test_corpus_shortlist(self):
+        print("\n Test Case 9: Corpus Shortlisting ")
+        corpus = {
+            'a': "The quick brown fox jumps over the lazy dog. It is a sunny day in the park.",
+            'b': "Birds are singing in the tall trees. The quick brown fox jumps over the lazy cat.",
+            'c': "Lorem ipsum dolor sit amet. Consectetur adipiscing elit sed do eiusmod."
+        }
+        results = detect_plagiarism_corpus(corpus, align=False)
+        print(f"Shortlisted pairs: {sorted(results)}")
+        self.assertEqual(sorted(results), [('a', 'b')])
+        self.assertEqual(len(results[('a', 'b')]['suspicious_pairs']), 1)
+
+    def test_incremental_realignment(self):
+        print("\n Test Case 10: Incremental Re-alignment ")
+        sentences = [f"Sentence number {k} talks about topic {k * 7 % 11}." for k in range(30)]
+        old_doc1 = ' '.join(sentences)
+        doc2 = ' '.join(sentences[:12] + ["A completely new claim appears here."] + sentences[12:])
+        edited = list(sentences)
+        edited[20] = "Sentence number twenty was rewritten by the student."
+        new_doc1 = ' '.join(edited)
+        previous = detect_plagiarism(old_doc1, doc2)
+        result = detect_plagiarism_incremental(previous, old_doc1, new_doc1, doc2)
+        full = detect_plagiarism(new_doc1, doc2)
+        print(f"Window: {result['window']}, Cost: {result['total_cost']}")
+        self.assertEqual(result['total_cost'], full['total_cost'])
+        self.assertEqual(len(result['suspicious_pairs']), len(full['suspicious_pairs']))
+        self.assertTrue(result['window'][0][1] - result['window'][0][0] < 30)
+
+    def test_synthetic_pair_stats(self):
+        print("\n Test Case 11: Synthetic Pairs and Search Counters ")
+        text1, text2 = make_document_pair(50, edit_rate=0.2, reorder_rate=0.04, seed=3)
+        self.assertEqual(make_document_pair(50, edit_rate=0.2, reorder_rate=0.04, seed=3), (text1, text2))
+        astar_stats, hirschberg_stats = {}, {}
+        result = detect_plagiarism(text1, text2, stats=astar_stats)
+        reference = detect_plagiarism(text1, text2, engine='hirschberg', stats=hirschberg_stats)
+        print(f"A*: {astar_stats}, Hirschberg: {hirschberg_stats}")
+        self.assertEqual(result['total_cost'], reference['total_cost'])
+        self.assertTrue(0 < astar_stats['levenshtein_calls'] <= astar_stats['nodes_expanded'])
+        self.assertTrue(hirschberg_stats['levenshtein_calls'] > 0)
+
+    def test_batch_resume_after_truncation(self):
+        print("\n Test Case 12: Batch Resume After a Cut-off Line ")
+        directory = tempfile.mkdtemp()
+        for k in range(4):
+            with open(os.path.join(directory, f"doc{k}.txt"), 'w', encoding='utf-8') as f:
+                f.write(f"Document {k} is short. It shares this sentence. Topic {k * 3} ends it.")
+        output = os.path.join(directory, 'results.jsonl')
+        first = run_batch(directory, output, workers=1, log=None)
+        self.assertEqual(first['compared'], 6)
+        with open(output, encoding='utf-8') as f:
+            lines = f.readlines()
+        # Two whole records plus half of the third, as left by an interrupt.
+        with open(output, 'w', encoding='utf-8') as f:
+            f.writelines(lines[:2])
+            f.write(lines[2][:len(lines[2]) // 2])
+        self.assertEqual(len(completed_pairs(output)), 2)
+        second = run_batch(directory, output, workers=1, log=None)
+        print(f"Skipped: {second['skipped']}, Compared: {second['compared']}")
+        self.assertEqual((second['skipped'], second['compared']), (2, 4))
+        with open(output, encoding='utf-8') as f:
+            pairs = [(record['doc1'], record['doc2']) for record in map(json.loads, f)]
+        self.assertEqual(sorted(pairs), sorted(completed_pairs(output)))
+        self.assertEqual(len(pairs), 6)
+
 if __name__ == '__main__':
     unittest.main()
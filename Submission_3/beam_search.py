@@ -1,7 +1,17 @@
+import heapq
 import random
 from heuristics import h1 
+from sat_state import SATState
+from compiled_formula import CompiledFormula, np
 
-def beam_search(formula, n, beam_width, h_func, max_steps=1000):
+def beam_search(formula, n, beam_width, h_func, max_steps=1000, incremental=False, batched=False,
+                bitset=False):
+    if bitset:
+        return beam_search_bitset(formula, n, beam_width, h_func, max_steps)
+    if batched:
+        return beam_search_batched(formula, n, beam_width, h_func, max_steps)
+    if incremental:
+        return beam_search_incremental(formula, n, beam_width, h_func, max_steps)
     beam = [[None] + [random.choice([False, True]) for _ in range(n)] for _ in range(beam_width)]
     for step in range(max_steps):
         for ass in beam:
@@ -15,4 +25,95 @@ def beam_search(formula, n, beam_width, h_func, max_steps=1000):
                 successors.append(new_ass)
         successors.sort(key=lambda ass: h_func(formula, ass))
         beam = successors[:beam_width]
-    return None, max_steps, False
\ No newline at end of file
+    return None, max_steps, False
+
+def beam_search_incremental(formula, n, beam_width, h_func, max_steps=1000):
+    # Successors are scored as parent score + cached flip delta; only the
+    # beam_width survivors are materialised as new states.
+    beam = [SATState(formula, n, [None] + [random.choice([False, True]) for _ in range(n)])
+            for _ in range(beam_width)]
+    for step in range(max_steps):
+        for state in beam:
+            if state.num_unsat == 0:
+                return state.assignment, step + 1, True
+        successors = []
+        for state in beam:
+            score = state.score(h_func)
+            deltas = state.deltas(h_func)
+            for v in range(1, n+1):
+                successors.append((score + deltas[v], state, v))
+        # Stable sort on the score alone keeps the original tie order.
+        successors.sort(key=lambda item: item[0])
+        beam = []
+        for _, state, v in successors[:beam_width]:
+            state = state.copy()
+            state.flip(v)
+            beam.append(state)
+    return None, max_steps, False
+
+def beam_search_batched(formula, n, beam_width, h_func, max_steps=1000, compiled=None):
+    # All beam_width * n successors are built as one (B x n) array and scored
+    # in a single vectorised call; a stable argsort keeps the original tie order.
+    if compiled is None:
+        compiled = CompiledFormula(formula, n)
+    beam = compiled.to_array([[None] + [random.choice([False, True]) for _ in range(n)]
+                              for _ in range(beam_width)])
+    columns = np.arange(n)
+    for step in range(max_steps):
+        solved = np.flatnonzero(compiled.h1(beam) == 0)
+        if len(solved):
+            return compiled.to_assignment(beam[solved[0]]), step + 1, True
+        successors = np.repeat(beam, n, axis=0)
+        successors[np.arange(len(successors)), np.tile(columns, len(beam))] ^= True
+        scores = compiled.evaluate(h_func, successors)
+        beam = successors[np.argsort(scores, kind='stable')[:beam_width]]
+    return None, max_steps, False
+
+def pack_assignment(assignment):
+    # Bit v - 1 holds variable v.
+    bits = 0
+    for v in range(len(assignment) - 1, 0, -1):
+        bits = (bits << 1) | assignment[v]
+    return bits
+
+def beam_search_bitset(formula, n, beam_width, h_func, max_steps=1000):
+    # Beam members are identified by their packed assignment. Each successor
+    # is a single int key (score, generation index), heapified and popped
+    # until beam_width new states are found, so the rest are never sorted and
+    # successors repeating each other or an earlier beam state are skipped.
+    beam = []
+    visited = set()
+    for _ in range(beam_width):
+        state = SATState(formula, n, [None] + [random.choice([False, True]) for _ in range(n)])
+        bits = pack_assignment(state.assignment)
+        if bits not in visited:
+            visited.add(bits)
+            beam.append((bits, state))
+    for step in range(max_steps):
+        for bits, state in beam:
+            if state.num_unsat == 0:
+                return state.assignment, step + 1, True
+        size = len(beam) * n
+        keys = []
+        for parent, (bits, state) in enumerate(beam):
+            score = state.score(h_func)
+            offset = parent * n - 1
+            deltas = state.deltas(h_func)
+            keys.extend([(score + deltas[v]) * size + offset + v for v in range(1, n+1)])
+        heapq.heapify(keys)
+        next_beam = []
+        while keys and len(next_beam) < beam_width:
+            parent, v = divmod(heapq.heappop(keys) % size, n)
+            bits, state = beam[parent]
+            child = bits ^ (1 << v)
+            if child in visited:
+                continue
+            visited.add(child)
+            state = state.copy()
+            state.flip(v + 1)
+            next_beam.append((child, state))
+        if not next_beam:
+            # Every successor was seen before: the beam stalls after step + 1 steps.
+            return None, step + 1, False
+        beam = next_beam
+    return None, max_steps, False
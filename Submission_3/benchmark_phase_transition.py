@@ -0,0 +1,169 @@
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from multiprocessing import Pool
+from generate_ksat import generate_k_sat
+from heuristics import h1
+from hill_climbing import hill_climbing
+from beam_search import beam_search
+from vnd import vnd
+from walksat import walksat, probsat
+from cdcl import cdcl
+
+try:
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+except ImportError:
+    plt = None
+
+# Every engine runs under a fixed budget so large or unsatisfiable instances
+# end. A step is what the engine itself counts, named in STEP_UNITS.
+ENGINES = {
+    'hill_climbing': lambda f, n: hill_climbing(f, n, h1, max_tries=10, incremental=True),
+    'beam_search': lambda f, n: beam_search(f, n, 10, h1, max_steps=200, bitset=True),
+    'vnd': lambda f, n: vnd(f, n, h1, max_tries=5, delta=True),
+    'walksat': lambda f, n: walksat(f, n, max_flips=100000, max_tries=1),
+    'probsat': lambda f, n: probsat(f, n, max_flips=100000, max_tries=1),
+    'cdcl': lambda f, n: cdcl(f, n, max_conflicts=20000),
+}
+
+STEP_UNITS = {'hill_climbing': 'iteration', 'beam_search': 'expansion', 'vnd': 'scan',
+              'walksat': 'flip', 'probsat': 'flip', 'cdcl': 'conflict'}
+
+QUICK_N = (20, 50, 100, 200)
+FULL_N = (20, 50, 100, 200, 500, 1000, 2000)
+RATIOS = (3.0, 3.5, 4.0, 4.26, 4.5, 5.0, 5.5, 6.0)
+
+def make_tasks(n_list, ratios, instances, engines, seed=0):
+    return [{'engine': engine, 'n': n, 'ratio': ratio, 'instance': i, 'seed': seed}
+            for n in n_list for ratio in ratios for i in range(instances) for engine in engines]
+
+def run_task(task):
+    n = task['n']
+    m = int(round(task['ratio'] * n))
+    random.seed(f"{task['seed']}/n={n}/m={m}/i={task['instance']}")
+    formula = generate_k_sat(3, m, n)
+    random.seed(f"{task['seed']}/n={n}/m={m}/i={task['instance']}/{task['engine']}")
+    start = time.perf_counter()
+    _, steps, solved = ENGINES[task['engine']](formula, n)
+    seconds = time.perf_counter() - start
+    # Local search can only show SAT; CDCL also proves UNSAT (solved=False)
+    # and gives up with None. An instance is decided once its status is known.
+    status = 'SAT' if solved else 'UNSAT' if solved is False and task['engine'] == 'cdcl' else 'UNKNOWN'
+    return dict(task, m=m, status=status, solved=status == 'SAT', decided=status != 'UNKNOWN', steps=steps,
+                seconds=round(seconds, 6))
+
+def _quantile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+def summarize(runs):
+    # One row per (engine, n, ratio): the fraction of runs that decided their
+    # instance (for CDCL this counts UNSAT proofs), median steps per second in
+    # the engine's own unit, and the time-to-solution distribution over the
+    # decided runs.
+    groups = {}
+    for run in runs:
+        groups.setdefault((run['engine'], run['n'], run['ratio']), []).append(run)
+    summary = []
+    for (engine, n, ratio), group in sorted(groups.items()):
+        solved_times = sorted(run['seconds'] for run in group if run['decided'])
+        rates = [run['steps'] / run['seconds'] for run in group if run['seconds'] > 0]
+        rate = statistics.median(rates) if rates else None
+        unit = STEP_UNITS[engine]
+        row = {'engine': engine, 'n': n, 'ratio': ratio, 'runs': len(group),
+               'decided_rate': len(solved_times) / len(group),
+               'sat_rate': sum(run['status'] == 'SAT' for run in group) / len(group),
+               'sat': sum(run['status'] == 'SAT' for run in group),
+               'unsat': sum(run['status'] == 'UNSAT' for run in group),
+               'step_unit': unit, 'median_steps_per_second': rate,
+               'median_flips_per_second': rate if unit == 'flip' else None,
+               'time_to_solution': solved_times}
+        if solved_times:
+            row.update(tts_p10=_quantile(solved_times, 0.1), tts_median=statistics.median(solved_times),
+                       tts_p90=_quantile(solved_times, 0.9))
+        summary.append(row)
+    return summary
+
+def plot(summary, path):
+    # Solve rate (top) and median time to solution (bottom) against m/n,
+    # one column per engine and one line per n.
+    engines = sorted({row['engine'] for row in summary})
+    fig, axes = plt.subplots(2, len(engines), figsize=(3.2 * len(engines), 6), sharex=True, squeeze=False)
+    for col, engine in enumerate(engines):
+        rows = [row for row in summary if row['engine'] == engine]
+        for n in sorted({row['n'] for row in rows}):
+            line = sorted((row for row in rows if row['n'] == n), key=lambda row: row['ratio'])
+            axes[0][col].plot([row['ratio'] for row in line], [row['decided_rate'] for row in line],
+                              marker='o', label=f"n={n}")
+            solved = [row for row in line if 'tts_median' in row]
+            axes[1][col].plot([row['ratio'] for row in solved], [row['tts_median'] for row in solved], marker='o')
+        axes[0][col].set_title(engine)
+        axes[0][col].set_ylim(-0.05, 1.05)
+        # A log axis with no positive points fails in tight_layout.
+        if any('tts_median' in row for row in rows):
+            axes[1][col].set_yscale('log')
+        axes[1][col].set_xlabel('m / n')
+    axes[0][0].set_ylabel('solved / decided')
+    axes[1][0].set_ylabel('median time to solution (s)')
+    axes[0][-1].legend(fontsize='small')
+    fig.tight_layout()
+    fig.savefig(path, dpi=120)
+    plt.close(fig)
+
+def run_benchmark(n_list=QUICK_N, ratios=RATIOS, instances=5, engines=None, seed=0, workers=None,
+                  output='phase_transition.json', plot_path=None, log=sys.stderr):
+    tasks = make_tasks(n_list, ratios, instances, engines or list(ENGINES), seed)
+    runs = []
+    with Pool(workers) as pool:
+        for run in pool.imap_unordered(run_task, tasks):
+            runs.append(run)
+            if log is not None:
+                print(f"{len(runs)}/{len(tasks)} {run['engine']} n={run['n']} m/n={run['ratio']}: "
+                      f"{run['status']}, {run['seconds']:.3f} s", file=log)
+    runs.sort(key=lambda run: (run['engine'], run['n'], run['ratio'], run['instance']))
+    summary = summarize(runs)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'runs': runs, 'summary': summary}, f, indent=1)
+    if plot_path and plt is not None:
+        plot(summary, plot_path)
+    return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep m/n and n over the SAT engines.")
+    parser.add_argument('--full', action='store_true', help="n up to 2000")
+    parser.add_argument('-n', '--n', type=int, nargs='+')
+    parser.add_argument('--ratios', type=float, nargs='+', default=list(RATIOS))
+    parser.add_argument('--instances', type=int, default=5)
+    parser.add_argument('--engines', nargs='+', choices=list(ENGINES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-j', '--workers', type=int, default=None)
+    parser.add_argument('-o', '--output', default='phase_transition.json')
+    parser.add_argument('--plot', default='phase_transition.png')
+    args = parser.parse_args(argv)
+    summary = run_benchmark(args.n or (FULL_N if args.full else QUICK_N), args.ratios, args.instances,
+                            args.engines, args.seed, args.workers, args.output)
+    print(f"{'engine':>14} {'n':>5} {'m/n':>5} {'decided':>8} {'sat/unsat':>10} {'rate':>20} {'median tts':>11}")
+    for row in summary:
+        rate = row['median_steps_per_second']
+        rate = '-' if rate is None else f"{round(rate)} {row['step_unit']}s/s"
+        tts = f"{row['tts_median']:.3f}" if 'tts_median' in row else '-'
+        print(f"{row['engine']:>14} {row['n']:>5} {row['ratio']:>5} {row['decided_rate']:>8.0%} "
+              f"{row['sat']:>4}/{row['unsat']:<5} {rate:>20} {tts:>11}")
+    # Plotted last, so a plotting error cannot cost the table.
+    if not args.plot:
+        return
+    if plt is None:
+        print("matplotlib is not installed; skipped the plot")
+        return
+    try:
+        plot(summary, args.plot)
+    except (ValueError, OSError) as e:
+        print(f"could not write the plot: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+import heapq
+
+# Literals are coded as 2v for v and 2v + 1 for -v, so code ^ 1 negates and
+# code >> 1 is the variable.
+def encode(lit):
+    return 2 * lit if lit > 0 else 1 - 2 * lit
+
+def luby(i):
+    # 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, ... for i = 1, 2, 3, ...
+    k = i.bit_length()
+    if i == (1 << k) - 1:
+        return 1 << (k - 1)
+    return luby(i - (1 << (k - 1)) + 1)
+
+class CDCLSolver:
+    # Conflict-driven clause learning: two-watched-literal propagation, first
+    # UIP learning with simple minimisation, VSIDS with phase saving, Luby
+    # restarts, and LBD-based clean-up of learnt clauses at restarts.
+    def __init__(self, formula, n, restart_unit=100, var_decay=0.95):
+        self.n = n
+        self.value = [0] * (2 * n + 2)
+        self.level = [0] * (n + 1)
+        self.reason = [None] * (n + 1)
+        self.phase = [1] * (n + 1)
+        self.seen = [False] * (n + 1)
+        self.activity = [0.0] * (n + 1)
+        self.var_inc = 1.0
+        self.var_decay = var_decay
+        self.restart_unit = restart_unit
+        self.trail = []
+        self.trail_lim = []
+        self.qhead = 0
+        self.watches = [[] for _ in range(2 * n + 2)]
+        self.clauses = []
+        self.learnts = []
+        self.lbd = {}
+        self.max_learnts = max(1000, len(formula) // 3)
+        self.heap = [(0.0, v) for v in range(1, n + 1)]
+        self.conflicts = 0
+        self.decisions = 0
+        self.propagations = 0
+        self.ok = True
+        units = []
+        for clause in formula:
+            lits = set(encode(lit) for lit in clause)
+            if any(lit ^ 1 in lits for lit in lits):
+                continue
+            lits = sorted(lits)
+            if not lits:
+                self.ok = False
+            elif len(lits) == 1:
+                units.append(lits[0])
+            else:
+                self._attach(lits)
+                self.clauses.append(lits)
+        # Units go in after every clause is watched, so propagation sees them all.
+        for lit in units:
+            if self.value[lit] == -1:
+                self.ok = False
+            elif self.value[lit] == 0:
+                self._assign(lit, None)
+
+    def _attach(self, clause):
+        self.watches[clause[0]].append(clause)
+        self.watches[clause[1]].append(clause)
+
+    def _assign(self, lit, reason):
+        self.value[lit] = 1
+        self.value[lit ^ 1] = -1
+        v = lit >> 1
+        self.level[v] = len(self.trail_lim)
+        self.reason[v] = reason
+        self.trail.append(lit)
+
+    def propagate(self):
+        # Returns a conflicting clause or None. Each clause keeps its two
+        # watched literals in positions 0 and 1; an implied literal is moved
+        # to position 0, so clause[0] is the literal a reason clause implies.
+        value = self.value
+        watches = self.watches
+        trail = self.trail
+        while self.qhead < len(trail):
+            false_lit = trail[self.qhead] ^ 1
+            self.qhead += 1
+            self.propagations += 1
+            ws = watches[false_lit]
+            i = j = 0
+            end = len(ws)
+            while i < end:
+                clause = ws[i]
+                i += 1
+                if clause[0] == false_lit:
+                    clause[0] = clause[1]
+                    clause[1] = false_lit
+                first = clause[0]
+                if value[first] == 1:
+                    ws[j] = clause
+                    j += 1
+                    continue
+                for k in range(2, len(clause)):
+                    lit = clause[k]
+                    if value[lit] != -1:
+                        clause[1] = lit
+                        clause[k] = false_lit
+                        watches[lit].append(clause)
+                        break
+                else:
+                    ws[j] = clause
+                    j += 1
+                    if value[first] == -1:
+                        while i < end:
+                            ws[j] = ws[i]
+                            j += 1
+                            i += 1
+                        del ws[j:]
+                        self.qhead = len(trail)
+                        return clause
+                    self._assign(first, clause)
+            del ws[j:]
+        return None
+
+    def _bump(self, v):
+        self.activity[v] += self.var_inc
+        if self.activity[v] > 1e100:
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.var_inc *= 1e-100
+            self._rebuild_heap()
+        elif self.value[2 * v] == 0:
+            heapq.heappush(self.heap, (-self.activity[v], v))
+
+    def _rebuild_heap(self):
+        self.heap = [(-self.activity[v], v) for v in range(1, self.n + 1) if self.value[2 * v] == 0]
+        heapq.heapify(self.heap)
+
+    def analyze(self, conflict):
+        # First-UIP learning. Returns (learnt clause, backjump level, lbd) with
+        # the asserting literal first and a literal of the backjump level second.
+        seen = self.seen
+        level = self.level
+        reason = self.reason
+        trail = self.trail
+        current = len(self.trail_lim)
+        learnt = [0]
+        counter = 0
+        index = len(trail) - 1
+        clause = conflict
+        start = 0
+        while True:
+            for k in range(start, len(clause)):
+                lit = clause[k]
+                v = lit >> 1
+                if not seen[v] and level[v] > 0:
+                    seen[v] = True
+                    self._bump(v)
+                    if level[v] >= current:
+                        counter += 1
+                    else:
+                        learnt.append(lit)
+            while not seen[trail[index] >> 1]:
+                index -= 1
+            p = trail[index]
+            index -= 1
+            v = p >> 1
+            seen[v] = False
+            counter -= 1
+            if counter == 0:
+                break
+            clause = reason[v]
+            start = 1
+        learnt[0] = p ^ 1
+        # Drop literals implied by other literals of the clause.
+        kept = [learnt[0]]
+        for lit in learnt[1:]:
+            r = reason[lit >> 1]
+            if r is None or not all(seen[q >> 1] or level[q >> 1] == 0 for q in r[1:]):
+                kept.append(lit)
+        for lit in learnt[1:]:
+            seen[lit >> 1] = False
+        learnt = kept
+        backjump = 0
+        if len(learnt) > 1:
+            best = max(range(1, len(learnt)), key=lambda k: level[learnt[k] >> 1])
+            learnt[1], learnt[best] = learnt[best], learnt[1]
+            backjump = level[learnt[1] >> 1]
+        lbd = len(set(level[lit >> 1] for lit in learnt))
+        return learnt, backjump, lbd
+
+    def backtrack(self, target):
+        if len(self.trail_lim) <= target:
+            return
+        value = self.value
+        stop = self.trail_lim[target]
+        for lit in self.trail[stop:]:
+            v = lit >> 1
+            value[lit] = value[lit ^ 1] = 0
+            self.reason[v] = None
+            self.phase[v] = lit & 1
+            heapq.heappush(self.heap, (-self.activity[v], v))
+        del self.trail[stop:]
+        del self.trail_lim[target:]
+        self.qhead = len(self.trail)
+        if len(self.heap) > 4 * self.n:
+            self._rebuild_heap()
+
+    def _pick_branch(self):
+        heap = self.heap
+        while heap:
+            _, v = heapq.heappop(heap)
+            if self.value[2 * v] == 0:
+                return 2 * v + self.phase[v]
+        return None
+
+    def _reduce_db(self):
+        # Called at level 0: keeps glue clauses (lbd <= 2) and the better half
+        # of the rest, then rebuilds every watch list from positions 0 and 1.
+        lbd = self.lbd
+        self.learnts.sort(key=lambda clause: (lbd[id(clause)], len(clause)))
+        half = len(self.learnts) // 2
+        kept = [clause for k, clause in enumerate(self.learnts) if k < half or lbd[id(clause)] <= 2]
+        self.lbd = {id(clause): lbd[id(clause)] for clause in kept}
+        self.learnts = kept
+        self.watches = [[] for _ in range(2 * self.n + 2)]
+        for clause in self.clauses:
+            self._attach(clause)
+        for clause in self.learnts:
+            self._attach(clause)
+        self.max_learnts = int(self.max_learnts * 1.1)
+
+    def _search(self, budget):
+        # Runs until SAT (True), UNSAT (False) or `budget` conflicts (None).
+        conflicts = 0
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                conflicts += 1
+                if not self.trail_lim:
+                    return False
+                learnt, backjump, lbd = self.analyze(conflict)
+                self.backtrack(backjump)
+                if len(learnt) == 1:
+                    self._assign(learnt[0], None)
+                else:
+                    self._attach(learnt)
+                    self.learnts.append(learnt)
+                    self.lbd[id(learnt)] = lbd
+                    self._assign(learnt[0], learnt)
+                self.var_inc /= self.var_decay
+            elif conflicts >= budget:
+                self.backtrack(0)
+                return None
+            else:
+                lit = self._pick_branch()
+                if lit is None:
+                    return True
+                self.decisions += 1
+                self.trail_lim.append(len(self.trail))
+                self._assign(lit, None)
+
+    def solve(self, max_conflicts=None):
+        # True (satisfiable), False (unsatisfiable) or None if max_conflicts ran out.
+        if not self.ok:
+            return False
+        restarts = 0
+        while max_conflicts is None or self.conflicts < max_conflicts:
+            restarts += 1
+            budget = luby(restarts) * self.restart_unit
+            if max_conflicts is not None:
+                budget = min(budget, max_conflicts - self.conflicts)
+            status = self._search(budget)
+            if status is not None:
+                self.ok = status
+                return status
+            if len(self.learnts) > self.max_learnts:
+                self._reduce_db()
+        return None
+
+    def model(self):
+        return [None] + [self.value[2 * v] == 1 for v in range(1, self.n + 1)]
+
+def cdcl(formula, n, max_conflicts=None):
+    # Complete solver with the engines' return shape: (assignment, conflicts,
+    # satisfiable), where satisfiable is None if max_conflicts ran out.
+    solver = CDCLSolver(formula, n)
+    status = solver.solve(max_conflicts)
+    return (solver.model() if status else None), solver.conflicts, status
+
+def label_instance(formula, n, max_conflicts=None):
+    status = cdcl(formula, n, max_conflicts)[2]
+    return 'SAT' if status else 'UNSAT' if status is False else 'UNKNOWN'
@@ -0,0 +1,81 @@
+from heuristics import h1, h2
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Upper bound on B * m * k literal lookups materialised at once.
+MAX_BATCH_LITERALS = 1 << 22
+
+class CompiledFormula:
+    # The formula as (m x k) arrays of 0-based variable indices and literal
+    # signs. Batches of assignments are (B x n) bool/uint8 arrays where column
+    # v - 1 holds variable v. Shorter clauses are padded and masked out.
+    def __init__(self, formula, n):
+        if np is None:
+            raise ImportError("CompiledFormula requires numpy")
+        self.n = n
+        self.m = len(formula)
+        self.k = max((len(clause) for clause in formula), default=0)
+        if all(len(clause) == self.k for clause in formula):
+            literals = np.array(formula, dtype=np.int64).reshape(self.m, self.k)
+        else:
+            literals = np.zeros((self.m, self.k), dtype=np.int64)
+            for c, clause in enumerate(formula):
+                literals[c, :len(clause)] = clause
+        self.set_literals(literals)
+
+    @classmethod
+    def from_literals(cls, literals, n):
+        # Builds directly from an (m x k) literal array, e.g. from dimacs.load_compiled.
+        if np is None:
+            raise ImportError("CompiledFormula requires numpy")
+        compiled = cls.__new__(cls)
+        compiled.n = n
+        compiled.m, compiled.k = literals.shape
+        compiled.set_literals(literals)
+        return compiled
+
+    def set_literals(self, literals):
+        # literals is an (m x k) array of signed DIMACS literals, 0 for padding.
+        self.var_idx = (np.abs(literals) - 1).clip(min=0).astype(np.int32)
+        self.positive = literals > 0
+        self.valid = literals != 0
+        self.padded = not self.valid.all()
+
+    def true_counts(self, batch):
+        # (B x m) number of true literals per clause for every assignment.
+        batch = np.asarray(batch, dtype=bool)
+        if batch.ndim == 1:
+            batch = batch[None, :]
+        counts = np.empty((batch.shape[0], self.m), dtype=np.int8 if self.k < 128 else np.int32)
+        step = max(1, MAX_BATCH_LITERALS // max(1, self.m * self.k))
+        for start in range(0, batch.shape[0], step):
+            lit_true = batch[start:start + step][:, self.var_idx] == self.positive
+            if self.padded:
+                lit_true &= self.valid
+            counts[start:start + step] = lit_true.sum(axis=2)
+        return counts
+
+    def h1(self, batch):
+        return (self.true_counts(batch) == 0).sum(axis=1)
+
+    def h2(self, batch):
+        # Same integer tenths as heuristics.h2, so scores compare identically.
+        counts = self.true_counts(batch).astype(np.int64)
+        return np.where(counts == 0, 10, 3 - counts).sum(axis=1) / 10
+
+    def evaluate(self, h_func, batch):
+        if h_func is h1:
+            return self.h1(batch)
+        if h_func is h2:
+            return self.h2(batch)
+        raise ValueError(f"No batched form for heuristic {h_func.__name__}")
+
+    def to_array(self, assignments):
+        # Repo-style assignments ([None, x1, ..., xn]) to a (B x n) bool array.
+        return np.array([assignment[1:] for assignment in assignments], dtype=bool)
+
+    def to_assignment(self, row):
+        return [None] + [bool(value) for value in row]
@@ -0,0 +1,118 @@
+from compiled_formula import CompiledFormula, np
+
+CHUNK_SIZE = 1 << 23
+
+def write_dimacs(path, clauses, n, m=None, comment=None):
+    # Writes clause by clause, so `clauses` may be a generator such as
+    # generate_ksat.iter_k_sat as long as m is given.
+    if m is None:
+        clauses = list(clauses)
+        m = len(clauses)
+    with open(path, 'w', encoding='ascii') as f:
+        if comment:
+            for line in comment.splitlines():
+                f.write(f"c {line}\n")
+        f.write(f"p cnf {n} {m}\n")
+        for clause in clauses:
+            f.write(' '.join(map(str, clause)))
+            f.write(' 0\n')
+
+def _read_header(f):
+    # Skips comments up to the problem line and returns (n, m).
+    for line in f:
+        if line.startswith(b'c') or not line.strip():
+            continue
+        fields = line.split()
+        if fields[:2] != [b'p', b'cnf'] or len(fields) != 4:
+            raise ValueError(f"Expected 'p cnf <n> <m>', got {line!r}")
+        return int(fields[2]), int(fields[3])
+    raise ValueError("Missing 'p cnf' problem line")
+
+def iter_dimacs(path):
+    # Yields (n, m) first, then each clause as a list of ints. Clauses may span
+    # lines; a '%' line (SATLIB's end marker) stops the stream.
+    with open(path, 'rb') as f:
+        yield _read_header(f)
+        clause = []
+        for line in f:
+            if line.startswith(b'c'):
+                continue
+            if line.startswith(b'%'):
+                break
+            for token in line.split():
+                lit = int(token)
+                if lit == 0:
+                    yield clause
+                    clause = []
+                else:
+                    clause.append(lit)
+        if clause:
+            yield clause
+
+def read_dimacs(path):
+    # Returns (formula, n) with the formula as a list of clauses, like generate_k_sat.
+    clauses = iter_dimacs(path)
+    n, m = next(clauses)
+    formula = list(clauses)
+    if len(formula) != m:
+        raise ValueError(f"Header announces {m} clauses, found {len(formula)}")
+    return formula, n
+
+def _parse_chunk(chunk):
+    if b'c' in chunk or b'%' in chunk:
+        lines = []
+        for line in chunk.split(b'\n'):
+            if line.startswith(b'%'):
+                break
+            if not line.startswith(b'c'):
+                lines.append(line)
+        chunk = b'\n'.join(lines)
+    return np.fromstring(chunk, dtype=np.int64, sep=' ')
+
+def read_literals(path, chunk_size=CHUNK_SIZE):
+    # Parses the clause section in fixed-size chunks with numpy, so memory is
+    # the literal array plus one chunk. Returns (literals, n) where literals is
+    # an (m x k) array padded with zeros for clauses shorter than the longest.
+    if np is None:
+        raise ImportError("read_literals requires numpy")
+    parts = []
+    with open(path, 'rb') as f:
+        n, m = _read_header(f)
+        tail = b''
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            # Only whole lines are parsed, so comments are never split.
+            chunk = tail + chunk
+            cut = chunk.rfind(b'\n') + 1
+            tail = chunk[cut:]
+            if not cut:
+                continue
+            parts.append(_parse_chunk(chunk[:cut]))
+            if b'%' in chunk[:cut]:
+                tail = b''
+                break
+        if tail.strip():
+            parts.append(_parse_chunk(tail))
+    flat = np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+    if len(flat) and flat[-1] != 0:
+        flat = np.append(flat, 0)
+    ends = np.flatnonzero(flat == 0)
+    if len(ends) != m:
+        raise ValueError(f"Header announces {m} clauses, found {len(ends)}")
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    lengths = ends - starts
+    k = int(lengths.max()) if m else 0
+    if m and (lengths == k).all():
+        return flat.reshape(m, k + 1)[:, :k], n
+    literals = np.zeros((m, k), dtype=np.int64)
+    columns = np.arange(len(flat)) - np.repeat(starts, lengths + 1)
+    keep = flat != 0
+    literals[np.repeat(np.arange(m), lengths + 1)[keep], columns[keep]] = flat[keep]
+    return literals, n
+
+def load_compiled(path):
+    # Reads a DIMACS file straight into the array layout of CompiledFormula.
+    literals, n = read_literals(path)
+    return CompiledFormula.from_literals(literals, n)
@@ -3,6 +3,8 @@ from heuristics import h1, h2
 from hill_climbing import hill_climbing
 from beam_search import beam_search
 from vnd import vnd
+from walksat import walksat, probsat
+from cdcl import label_instance
 
 def run_experiment(n, m_list, num_instances=5):
     k = 3
@@ -10,6 +12,8 @@ def run_experiment(n, m_list, num_instances=5):
         print(f"\nFor n={n}, m={m}")
         for i in range(num_instances):
             formula = generate_k_sat(k, m, n)
+            # Certify first: solved=False on an UNSAT instance is not a search failure.
+            print(f"Instance {i}: {label_instance(formula, n)}")
             for h, h_name in [(h1, "h1"), (h2, "h2")]:
                 _, steps, solved = hill_climbing(formula, n, h)
                 N = steps * n
@@ -27,6 +31,11 @@ def run_experiment(n, m_list, num_instances=5):
                 N = steps * (n**3 / 18)
                 p = steps / N if N > 0 else 0
                 print(f"Instance {i}, {h_name}, VND: solved={solved}, steps={steps}, penetrance={p:.4f}")
+            # The random walks pick from unsatisfied clauses, not by h, so they run once per instance.
+            # They expand no neighbourhood, so no penetrance is reported for them.
+            for solver, solver_name in [(walksat, "WalkSAT"), (probsat, "ProbSAT")]:
+                _, steps, solved = solver(formula, n, max_flips=10000)
+                print(f"Instance {i}, {solver_name}: solved={solved}, steps={steps}")
 
 if __name__ == "__main__":
     n_list = [10, 20]
@@ -1,20 +1,27 @@
 import random
 import sys
 
-def generate_k_sat(k, m, n):
-    formula = []
+def iter_k_sat(k, m, n):
+    # Yields the clauses one at a time, drawing the same random numbers as
+    # generate_k_sat, so large instances can be streamed to disk.
     for _ in range(m):
         vars_ = random.sample(range(1, n+1), k) 
         clause = [random.choice([-1, 1]) * v for v in vars_]
-        formula.append(clause)
-    return formula
+        yield clause
+
+def generate_k_sat(k, m, n):
+    return list(iter_k_sat(k, m, n))
 
 if __name__ == "__main__":
-    if len(sys.argv) != 4:
-        print("Usage: python generate_ksat.py <k> <m> <n>")
+    if len(sys.argv) not in (4, 5):
+        print("Usage: python generate_ksat.py <k> <m> <n> [output.cnf]")
         sys.exit(1)
     k = int(sys.argv[1])
     m = int(sys.argv[2])
     n = int(sys.argv[3])
-    formula = generate_k_sat(k, m, n)
-    print(formula)
\ No newline at end of file
+    if len(sys.argv) == 5:
+        from dimacs import write_dimacs
+        write_dimacs(sys.argv[4], iter_k_sat(k, m, n), n, m)
+    else:
+        formula = generate_k_sat(k, m, n)
+        print(formula)
\ No newline at end of file
@@ -6,11 +6,13 @@ def h1(formula, assignment):
             uns += 1
     return uns
 def h2(formula, assignment):
-    score = 0.0
+    # Summed in tenths and scaled once, so equal scores compare equal
+    # no matter in which order the clauses were added up.
+    score = 0
     for clause in formula:
         num_true = sum(1 for lit in clause if get_literal_value(lit, assignment))
         if num_true == 0:
-            score += 1.0
+            score += 10
         else:
-            score += (3 - num_true) * 0.1
-    return score
\ No newline at end of file
+            score += 3 - num_true
+    return score / 10
\ No newline at end of file
@@ -1,6 +1,9 @@
 import random
 from heuristics import h1
-def hill_climbing(formula, n, h_func, max_tries=100, max_flips=1000):
+from sat_state import SATState
+def hill_climbing(formula, n, h_func, max_tries=100, max_flips=1000, incremental=False):
+    if incremental:
+        return hill_climbing_incremental(formula, n, h_func, max_tries, max_flips)
     steps = 0
     for t in range(max_tries):
         assignment = [None] + [random.choice([False, True]) for _ in range(n)]
@@ -25,4 +28,24 @@ def hill_climbing(formula, n, h_func, max_tries=100, max_flips=1000):
                 assignment[v] = not assignment[v]
             else:
                 break
-    return None, steps, False
\ No newline at end of file
+    return None, steps, False
+
+def hill_climbing_incremental(formula, n, h_func, max_tries=100, max_flips=1000):
+    # Same search and random choices as hill_climbing, but each step reads the
+    # cached flip deltas from a SATState instead of re-evaluating h per variable.
+    steps = 0
+    for t in range(max_tries):
+        assignment = [None] + [random.choice([False, True]) for _ in range(n)]
+        state = SATState(formula, n, assignment)
+        for f in range(max_flips):
+            steps += 1
+            if state.num_unsat == 0:
+                return assignment, steps, True
+            deltas = state.deltas(h_func)
+            best_delta = min(deltas[1:])
+            if best_delta < 0:
+                best_vars = [v for v in range(1, n+1) if deltas[v] == best_delta]
+                state.flip(random.choice(best_vars))
+            else:
+                break
+    return None, steps, False
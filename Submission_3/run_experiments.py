@@ -0,0 +1,180 @@
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool
+from generate_ksat import generate_k_sat
+from heuristics import h1, h2
+from hill_climbing import hill_climbing
+from beam_search import beam_search
+from vnd import vnd
+from walksat import walksat, probsat
+from cdcl import label_instance
+
+HEURISTICS = {'h1': h1, 'h2': h2}
+
+# name: (run(formula, n, h_func), nodes examined per step for the penetrance,
+# whether it uses the heuristic). Nodes per step follow experiment.py; the
+# random walks expand no neighbourhood, so they have no penetrance.
+ALGORITHMS = {
+    'Hill-Climbing': (lambda f, n, h: hill_climbing(f, n, h, incremental=True), lambda n, k: n, True),
+    'Beam-3': (lambda f, n, h: beam_search(f, n, 3, h, incremental=True), lambda n, k: 3 * n, True),
+    'Beam-4': (lambda f, n, h: beam_search(f, n, 4, h, incremental=True), lambda n, k: 4 * n, True),
+    'VND': (lambda f, n, h: vnd(f, n, h, incremental=True), lambda n, k: n**3 / 18, True),
+    'WalkSAT': (lambda f, n, h: walksat(f, n, max_flips=10000), None, False),
+    'ProbSAT': (lambda f, n, h: probsat(f, n, max_flips=10000), None, False),
+}
+
+FIELDS = ['task', 'n', 'm', 'k', 'instance', 'status', 'heuristic', 'algorithm', 'seed',
+          'solved', 'steps', 'nodes', 'penetrance', 'seconds']
+
+def make_tasks(n_list, ratios, num_instances, heuristics, algorithms, k=3, seed=0):
+    tasks = []
+    for n in n_list:
+        for ratio in ratios:
+            m = int(ratio * n)
+            for i in range(num_instances):
+                for name in algorithms:
+                    # Random walks ignore the heuristic, so they run once per instance.
+                    for h_name in (heuristics if ALGORITHMS[name][2] else ['-']):
+                        task = f"n={n}/m={m}/k={k}/i={i}/{h_name}/{name}"
+                        tasks.append({'task': task, 'n': n, 'm': m, 'k': k, 'instance': i,
+                                      'heuristic': h_name, 'algorithm': name, 'seed': seed})
+    return tasks
+
+# Conflict budget for the SAT / UNSAT label; harder instances are labelled UNKNOWN.
+LABEL_CONFLICTS = 20000
+
+def instance_key(task):
+    return f"{task['seed']}/n={task['n']}/m={task['m']}/k={task['k']}/i={task['instance']}"
+
+def make_formula(task):
+    # The instance depends only on (seed, n, m, k, i), so every algorithm and
+    # heuristic sees the same formula.
+    random.seed(instance_key(task))
+    return generate_k_sat(task['k'], task['m'], task['n'])
+
+def label_task(task):
+    return instance_key(task), label_instance(make_formula(task), task['n'], task['max_conflicts'])
+
+def run_task(task):
+    n, k = task['n'], task['k']
+    formula = make_formula(task)
+    # The search gets its own seed per task.
+    random.seed(f"{task['seed']}/{task['task']}")
+    run, nodes_per_step, _ = ALGORITHMS[task['algorithm']]
+    start = time.perf_counter()
+    _, steps, solved = run(formula, n, HEURISTICS.get(task['heuristic']))
+    seconds = time.perf_counter() - start
+    if nodes_per_step is None:
+        nodes = penetrance = None
+    else:
+        nodes = steps * nodes_per_step(n, k)
+        penetrance = steps / nodes if nodes > 0 else 0
+    # A model found by the search settles an instance the label left UNKNOWN.
+    status = 'SAT' if solved else task.get('status')
+    return dict(task, status=status, solved=solved, steps=steps, nodes=nodes,
+                penetrance=penetrance, seconds=round(seconds, 6))
+
+def completed_tasks(output_path):
+    # Tasks already written by an earlier run; a line cut off by an interrupt is ignored.
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding='utf-8') as f:
+        for line in f:
+            # Only whole lines count: a cut-off last line is truncated before appending.
+            if not line.endswith('\n'):
+                continue
+            try:
+                done.add(json.loads(line)['task'])
+            except (json.JSONDecodeError, KeyError):
+                continue
+    return done
+
+def _truncate_partial_line(output_path, block_size=4096):
+    # Drops a last line cut off by an interrupt, reading back from the end
+    # only as far as the previous newline.
+    if not os.path.exists(output_path):
+        return
+    with open(output_path, 'rb+') as f:
+        end = pos = f.seek(0, os.SEEK_END)
+        while pos > 0:
+            start = max(0, pos - block_size)
+            f.seek(start)
+            block = f.read(pos - start)
+            if pos == end and block.endswith(b'\n'):
+                return
+            newline = block.rfind(b'\n')
+            if newline >= 0:
+                f.truncate(start + newline + 1)
+                return
+            pos = start
+        f.truncate(0)
+
+def run_grid(tasks, output_path, workers=None, chunksize=1, label_conflicts=LABEL_CONFLICTS, log=sys.stderr):
+    done = completed_tasks(output_path)
+    pending = [task for task in tasks if task['task'] not in done]
+    stats = {'tasks': len(tasks), 'skipped': len(tasks) - len(pending), 'completed': 0, 'solved': 0}
+    if not pending:
+        return stats
+    _truncate_partial_line(output_path)
+    start = time.perf_counter()
+    with open(output_path, 'a', encoding='utf-8') as out, Pool(workers) as pool:
+        # Every pending instance is labelled once by the complete solver
+        # before any search task runs.
+        instances = {}
+        for task in pending:
+            instances.setdefault(instance_key(task), dict(task, max_conflicts=label_conflicts))
+        labels = dict(pool.imap_unordered(label_task, instances.values()))
+        pending = [dict(task, status=labels[instance_key(task)]) for task in pending]
+        for record in pool.imap_unordered(run_task, pending, chunksize):
+            out.write(json.dumps(record) + '\n')
+            out.flush()
+            stats['completed'] += 1
+            stats['solved'] += record['solved']
+            if log is not None:
+                print(f"{stats['completed']}/{len(pending)} {record['task']}: solved={record['solved']}, "
+                      f"steps={record['steps']}, {record['seconds']:.3f} s", file=log)
+    stats['seconds'] = time.perf_counter() - start
+    return stats
+
+def write_csv(output_path, csv_path):
+    # Sorted by task so the CSV does not depend on worker completion order.
+    with open(output_path, encoding='utf-8') as f:
+        records = [json.loads(line) for line in f if line.endswith('\n')]
+    records.sort(key=lambda record: (record['n'], record['m'], record['instance'],
+                                     record['heuristic'], record['algorithm']))
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, FIELDS)
+        writer.writeheader()
+        for record in records:
+            writer.writerow({field: record.get(field) for field in FIELDS})
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the k-SAT experiment grid in parallel.")
+    parser.add_argument('-n', '--n', type=int, nargs='+', default=[10, 20])
+    parser.add_argument('--ratios', type=float, nargs='+', default=[2, 4, 6])
+    parser.add_argument('--instances', type=int, default=5)
+    parser.add_argument('-k', type=int, default=3)
+    parser.add_argument('--heuristics', nargs='+', choices=sorted(HEURISTICS), default=['h1', 'h2'])
+    parser.add_argument('--algorithms', nargs='+', choices=list(ALGORITHMS), default=list(ALGORITHMS))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', default='experiment_results.jsonl')
+    parser.add_argument('--csv', help="also write the collected results as CSV")
+    parser.add_argument('-j', '--workers', type=int, default=None)
+    parser.add_argument('--chunksize', type=int, default=1)
+    parser.add_argument('--label-conflicts', type=int, default=LABEL_CONFLICTS,
+                        help="CDCL conflict budget per SAT / UNSAT label")
+    args = parser.parse_args(argv)
+    tasks = make_tasks(args.n, args.ratios, args.instances, args.heuristics, args.algorithms, args.k, args.seed)
+    stats = run_grid(tasks, args.output, args.workers, args.chunksize, args.label_conflicts)
+    if args.csv:
+        write_csv(args.output, args.csv)
+    print(json.dumps(stats))
+
+if __name__ == "__main__":
+    main()
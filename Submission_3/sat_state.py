@@ -0,0 +1,112 @@
+from heuristics import h1, h2
+
+def h2_units(num_true):
+    # h2 per clause in tenths, the same integer units heuristics.h2 sums.
+    return 10 if num_true == 0 else 3 - num_true
+
+def h1_units(num_true):
+    return 1 if num_true == 0 else 0
+
+def clause_units(h_func):
+    # Per-clause value as a function of its true-literal count.
+    if h_func is h1:
+        return h1_units
+    if h_func is h2:
+        return h2_units
+    raise ValueError(f"No incremental form for heuristic {h_func.__name__}")
+
+class SATState:
+    # Clause bookkeeping for local search: true-literal counts per clause,
+    # the clauses each variable occurs in, and for every variable how h1
+    # (make / break counts) and h2 would change if it were flipped. A flip
+    # only touches the clauses containing the flipped variable.
+    def __init__(self, formula, n, assignment):
+        self.formula = formula
+        self.n = n
+        self.assignment = assignment
+        # Each clause as (var, w) pairs with w = positive - negative occurrences,
+        # so flipping var changes the clause's true count by -w if var is true, else +w.
+        self.clause_vars = []
+        self.occurrences = [[] for _ in range(n + 1)]
+        for c, clause in enumerate(formula):
+            weights = {}
+            for lit in clause:
+                weights[abs(lit)] = weights.get(abs(lit), 0) + (1 if lit > 0 else -1)
+            self.clause_vars.append(tuple(weights.items()))
+            for v in weights:
+                self.occurrences[v].append(c)
+        self.true_count = [sum(1 for lit in clause if (lit > 0) == assignment[abs(lit)]) for clause in formula]
+        self.num_unsat = self.true_count.count(0)
+        self.h2_total = sum(h2_units(t) for t in self.true_count)
+        self.make = [0] * (n + 1)
+        self.brk = [0] * (n + 1)
+        self.delta2 = [0] * (n + 1)
+        for c in range(len(formula)):
+            self._account(c, 1)
+
+    def _account(self, c, sign):
+        # Adds (sign=1) or removes (sign=-1) clause c's share of every cached score.
+        t = self.true_count[c]
+        assignment = self.assignment
+        for v, w in self.clause_vars[c]:
+            new_t = t - w if assignment[v] else t + w
+            if t == 0 and new_t > 0:
+                self.make[v] += sign
+            elif t > 0 and new_t == 0:
+                self.brk[v] += sign
+            self.delta2[v] += sign * (h2_units(new_t) - h2_units(t))
+
+    def flip(self, v):
+        occurrences = self.occurrences[v]
+        for c in occurrences:
+            self._account(c, -1)
+        value = self.assignment[v]
+        self.assignment[v] = not value
+        for c in occurrences:
+            for u, w in self.clause_vars[c]:
+                if u == v:
+                    t = self.true_count[c]
+                    new_t = t - w if value else t + w
+                    self.true_count[c] = new_t
+                    self.num_unsat += (new_t == 0) - (t == 0)
+                    self.h2_total += h2_units(new_t) - h2_units(t)
+                    break
+            self._account(c, 1)
+
+    def copy(self):
+        other = SATState.__new__(SATState)
+        other.formula = self.formula
+        other.n = self.n
+        other.clause_vars = self.clause_vars
+        other.occurrences = self.occurrences
+        other.assignment = self.assignment.copy()
+        other.true_count = self.true_count.copy()
+        other.num_unsat = self.num_unsat
+        other.h2_total = self.h2_total
+        other.make = self.make.copy()
+        other.brk = self.brk.copy()
+        other.delta2 = self.delta2.copy()
+        return other
+
+    def score(self, h_func):
+        # Current heuristic value in integer units: h1 as is, h2 in tenths.
+        if h_func is h1:
+            return self.num_unsat
+        if h_func is h2:
+            return self.h2_total
+        raise ValueError(f"No incremental form for heuristic {h_func.__name__}")
+
+    def delta(self, v, h_func):
+        if h_func is h1:
+            return self.brk[v] - self.make[v]
+        if h_func is h2:
+            return self.delta2[v]
+        raise ValueError(f"No incremental form for heuristic {h_func.__name__}")
+
+    def deltas(self, h_func):
+        # Score change for flipping each variable; index 0 is unused.
+        if h_func is h1:
+            return [b - m for b, m in zip(self.brk, self.make)]
+        if h_func is h2:
+            return list(self.delta2)
+        raise ValueError(f"No incremental form for heuristic {h_func.__name__}")
@@ -0,0 +1,365 @@
+import unittest
+import itertools
+import json
+import os
+import tempfile
+import random
+from unittest import mock
+import beam_search as beam_module
+from cdcl import cdcl, label_instance
+from generate_ksat import generate_k_sat
+from heuristics import h1, h2
+from hill_climbing import hill_climbing
+from beam_search import beam_search
+from vnd import vnd, _pair_clauses, _move_delta
+from sat_state import SATState, clause_units
+from walksat import walksat, probsat
+from run_experiments import make_tasks, run_grid, completed_tasks, _truncate_partial_line
+from compiled_formula import CompiledFormula, np
+from dimacs import write_dimacs, read_dimacs, read_literals, load_compiled
+
+def brute_force(formula, n):
+    for values in itertools.product([False, True], repeat=n):
+        assignment = [None] + list(values)
+        if all(any((lit > 0) == assignment[abs(lit)] for lit in clause) for clause in formula):
+            return True
+    return False
+
+def satisfies(formula, assignment):
+    return all(any((lit > 0) == assignment[abs(lit)] for lit in clause) for clause in formula)
+
+def random_formula(n, m, rng):
+    # Mixed clause lengths, including units, empty and tautological clauses
+    # and repeated literals.
+    formula = []
+    for _ in range(m):
+        r = rng.random()
+        if r < 0.02:
+            formula.append([])
+        elif r < 0.1:
+            v = rng.randint(1, n)
+            formula.append([v, -v, rng.choice([-1, 1]) * rng.randint(1, n)])
+        else:
+            formula.append([rng.choice([-1, 1]) * rng.randint(1, n) for _ in range(rng.randint(1, 4))])
+    return formula
+
+class TestCDCL(unittest.TestCase):
+
+    def test_against_brute_force(self):
+        print("\n Test Case 1: CDCL vs Brute Force ")
+        rng = random.Random(0)
+        counts = {True: 0, False: 0}
+        for _ in range(400):
+            n = rng.randint(1, 10)
+            formula = random_formula(n, rng.randint(0, 6 * n), rng)
+            assignment, _, status = cdcl(formula, n)
+            self.assertEqual(status, brute_force(formula, n), formula)
+            if status:
+                self.assertTrue(satisfies(formula, assignment), formula)
+            counts[status] += 1
+        print(f"SAT: {counts[True]}, UNSAT: {counts[False]}")
+        self.assertTrue(counts[True] > 50 and counts[False] > 50)
+
+    def test_edge_cases(self):
+        print("\n Test Case 2: Empty, Unit and Tautological Clauses ")
+        self.assertEqual(label_instance([], 3), 'SAT')
+        self.assertEqual(label_instance([[]], 3), 'UNSAT')
+        self.assertEqual(label_instance([[1, -1]], 1), 'SAT')
+        self.assertEqual(label_instance([[1], [-1]], 1), 'UNSAT')
+        self.assertEqual(label_instance([[1], [-1, 2], [-2, 3], [-3]], 3), 'UNSAT')
+        assignment, _, status = cdcl([[2], [-2, -3], [1, 3, -1]], 3)
+        self.assertTrue(status)
+        self.assertEqual(assignment[2:], [True, False])
+
+    def test_conflict_budget(self):
+        print("\n Test Case 3: Conflict Budget ")
+        # Pigeonhole 6 -> 5 needs many conflicts, so a tiny budget gives up.
+        holes = 5
+        var = lambda p, h: p * holes + h + 1
+        formula = [[var(p, h) for h in range(holes)] for p in range(holes + 1)]
+        formula += [[-var(p, h), -var(q, h)] for h in range(holes)
+                    for p in range(holes + 1) for q in range(p + 1, holes + 1)]
+        n = (holes + 1) * holes
+        self.assertEqual(label_instance(formula, n, max_conflicts=10), 'UNKNOWN')
+        self.assertEqual(label_instance(formula, n), 'UNSAT')
+
+def seeded(run, seed):
+    random.seed(seed)
+    return run()
+
+class TestIncremental(unittest.TestCase):
+
+    def test_same_results_as_full_rescan(self):
+        print("\n Test Case 4: Incremental Search Matches the Full Rescan ")
+        for i in range(6):
+            n = 8 + i
+            random.seed(f"formula/{i}")
+            formula = generate_k_sat(3, int((2 + 0.5 * i) * n), n)
+            for h in (h1, h2):
+                runs = [
+                    lambda incremental: hill_climbing(formula, n, h, max_tries=5, max_flips=50, incremental=incremental),
+                    lambda incremental: beam_search(formula, n, 3, h, max_steps=30, incremental=incremental),
+                    lambda incremental: vnd(formula, n, h, max_tries=2, incremental=incremental),
+                ]
+                for run in runs:
+                    self.assertEqual(seeded(lambda: run(True), i), seeded(lambda: run(False), i))
+
+    def test_state_deltas_after_flips(self):
+        print("\n Test Case 5: Cached Deltas vs Full h1 / h2 ")
+        rng = random.Random(1)
+        for _ in range(20):
+            n = rng.randint(2, 12)
+            formula = [clause for clause in random_formula(n, 5 * n, rng) if clause]
+            assignment = [None] + [rng.random() < 0.5 for _ in range(n)]
+            state = SATState(formula, n, assignment)
+            for _ in range(15):
+                state.flip(rng.randint(1, n))
+                self.assertEqual(state.score(h1), h1(formula, assignment))
+                self.assertEqual(state.score(h2), round(10 * h2(formula, assignment)))
+                for v in range(1, n + 1):
+                    flipped = assignment.copy()
+                    flipped[v] = not flipped[v]
+                    self.assertEqual(state.delta(v, h1), h1(formula, flipped) - h1(formula, assignment))
+                    self.assertEqual(state.delta(v, h2),
+                                     round(10 * h2(formula, flipped)) - round(10 * h2(formula, assignment)))
+                    self.assertEqual(state.make[v], sum(1 for clause in formula
+                                     if not any((lit > 0) == assignment[abs(lit)] for lit in clause)
+                                     and any((lit > 0) == flipped[abs(lit)] for lit in clause)))
+
+def units_score(h, formula, assignment):
+    # h in the integer units the delta code works in: h1 as is, h2 in tenths.
+    return h1(formula, assignment) if h is h1 else round(10 * h2(formula, assignment))
+
+def reference_vnd_delta(formula, n, h, max_tries=10, k_max=3):
+    # vnd_delta's neighbourhoods (k-flips of variables from unsatisfied
+    # clauses, first strictly best move) scored by full re-evaluation.
+    steps = 0
+    for t in range(max_tries):
+        assignment = [None] + [random.choice([False, True]) for _ in range(n)]
+        k = 1
+        while k <= k_max:
+            steps += 1
+            if h1(formula, assignment) == 0:
+                return assignment, steps, True
+            candidates = sorted({abs(lit) for clause in formula
+                                 if not any((l > 0) == assignment[abs(l)] for l in clause) for lit in clause})
+            current = best = units_score(h, formula, assignment)
+            best_flips = None
+            for flips in itertools.combinations(candidates, k):
+                for v in flips:
+                    assignment[v] = not assignment[v]
+                new = units_score(h, formula, assignment)
+                if new < best:
+                    best, best_flips = new, flips
+                for v in flips:
+                    assignment[v] = not assignment[v]
+            if best_flips is not None:
+                for v in best_flips:
+                    assignment[v] = not assignment[v]
+                k = 1
+            else:
+                k = k + 1
+    return None, steps, False
+
+class TestVNDDelta(unittest.TestCase):
+
+    def test_move_delta(self):
+        print("\n Test Case 6: Multi-flip Deltas vs Full Re-evaluation ")
+        rng = random.Random(2)
+        for _ in range(30):
+            n = rng.randint(3, 10)
+            formula = [clause for clause in random_formula(n, 4 * n, rng) if clause]
+            assignment = [None] + [rng.random() < 0.5 for _ in range(n)]
+            state = SATState(formula, n, assignment)
+            pairs = _pair_clauses(state)
+            for h in (h1, h2):
+                deltas = state.deltas(h)
+                for k in (2, 3):
+                    for flips in itertools.combinations(range(1, n + 1), k):
+                        flipped = assignment.copy()
+                        for v in flips:
+                            flipped[v] = not flipped[v]
+                        expected = units_score(h, formula, flipped) - units_score(h, formula, assignment)
+                        self.assertEqual(_move_delta(state, flips, deltas, pairs, clause_units(h)), expected)
+
+    def test_vnd_delta_matches_rescan(self):
+        print("\n Test Case 7: vnd_delta vs VND Rescan over the Same Neighbourhoods ")
+        for i in range(8):
+            n = 8 + i
+            random.seed(f"vnd/{i}")
+            formula = generate_k_sat(3, int((3 + 0.25 * i) * n), n)
+            for h in (h1, h2):
+                expected = seeded(lambda: reference_vnd_delta(formula, n, h, max_tries=3), i)
+                result = seeded(lambda: vnd(formula, n, h, max_tries=3, delta=True), i)
+                self.assertEqual(result, expected)
+                if result[2]:
+                    self.assertTrue(satisfies(formula, result[0]))
+
+class TrackedState(SATState):
+    # Records every state the bitset beam copies; each copy is flipped once
+    # and then becomes a beam member.
+    copies = []
+
+    def copy(self):
+        other = SATState.copy(self)
+        other.__class__ = TrackedState
+        TrackedState.copies.append(other)
+        return other
+
+class TestBitsetBeam(unittest.TestCase):
+
+    def test_no_duplicate_states(self):
+        print("\n Test Case 8: Bitset Beam Holds No Duplicates ")
+        random.seed(3)
+        formula = generate_k_sat(3, 96, 12)
+        TrackedState.copies = []
+        with mock.patch.object(beam_module, 'SATState', TrackedState):
+            result = beam_search(formula, 12, 5, h1, max_steps=40, bitset=True)
+        members = [tuple(state.assignment) for state in TrackedState.copies]
+        print(f"Result: {result[1:]}, beam members: {len(members)}")
+        self.assertTrue(len(members) > 20)
+        self.assertEqual(len(members), len(set(members)))
+
+    def test_step_counts(self):
+        print("\n Test Case 9: Bitset Beam Step Counts ")
+        self.assertEqual(beam_search([[1, 2]], 2, 3, h1, max_steps=0, bitset=True), (None, 0, False))
+        # Unsatisfiable in 3 variables: both variants spend the whole budget.
+        unsat = [[a * 1, b * 2, c * 3] for a in (-1, 1) for b in (-1, 1) for c in (-1, 1)]
+        for width in (1, 2):
+            expected = seeded(lambda: beam_search(unsat, 3, width, h1, max_steps=3, incremental=True), 0)
+            self.assertEqual(seeded(lambda: beam_search(unsat, 3, width, h1, max_steps=3, bitset=True), 0), expected)
+            self.assertEqual(expected, (None, 3, False))
+        # With width 1 the beam walks the square 00-01-11-10 of an
+        # unsatisfiable 2-variable formula and stalls after 4 steps.
+        square = [[a * 1, b * 2] for a in (-1, 1) for b in (-1, 1)]
+        for seed in range(5):
+            self.assertEqual(seeded(lambda: beam_search(square, 2, 1, h1, max_steps=100, bitset=True), seed),
+                             (None, 4, False))
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestDimacs(unittest.TestCase):
+
+    def check_reads(self, path, formula, n):
+        self.assertEqual(read_dimacs(path), (formula, n))
+        k = max(len(clause) for clause in formula)
+        padded = [clause + [0] * (k - len(clause)) for clause in formula]
+        # Chunks of a few bytes make clauses and comments straddle chunk boundaries.
+        for chunk_size in (1, 3, 7, 64, 1 << 20):
+            literals, read_n = read_literals(path, chunk_size)
+            self.assertEqual((literals.tolist(), read_n), (padded, n))
+        compiled = load_compiled(path)
+        self.assertEqual((compiled.m, compiled.k, compiled.n), (len(formula), k, n))
+
+    def test_round_trip(self):
+        print("\n Test Case 10: DIMACS Round Trip ")
+        directory = tempfile.mkdtemp()
+        random.seed(4)
+        formula = generate_k_sat(3, 40, 15) + [[7], [-2, 5], [1, -3, 4, -6, 8]]
+        path = os.path.join(directory, 'written.cnf')
+        write_dimacs(path, iter(formula), 15, len(formula), comment="random 3-SAT\nplus mixed lengths")
+        self.check_reads(path, formula, 15)
+
+    def test_comments_spans_and_terminator(self):
+        print("\n Test Case 11: DIMACS Comments, Spanning Clauses and '%' ")
+        path = os.path.join(tempfile.mkdtemp(), 'satlib.cnf')
+        with open(path, 'w', encoding='ascii') as f:
+            f.write("c header comment\nc another one\n\np cnf 6 4\n"
+                    "1 -2\n3 0 -4 5 0\nc comment between clauses\n"
+                    "  -6\n  1 2 0\n"
+                    "4 -5 6 0\n%\n0\n")
+        self.check_reads(path, [[1, -2, 3], [-4, 5], [-6, 1, 2], [4, -5, 6]], 6)
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestCompiledFormula(unittest.TestCase):
+
+    def test_batched_heuristics(self):
+        print("\n Test Case 12: Batched h1 / h2 ")
+        rng = random.Random(5)
+        for _ in range(10):
+            n = rng.randint(2, 20)
+            formula = [clause for clause in random_formula(n, 5 * n, rng) if clause]
+            compiled = CompiledFormula(formula, n)
+            assignments = [[None] + [rng.random() < 0.5 for _ in range(n)] for _ in range(16)]
+            batch = compiled.to_array(assignments)
+            self.assertEqual(compiled.h1(batch).tolist(), [h1(formula, a) for a in assignments])
+            self.assertEqual(compiled.evaluate(h2, batch).tolist(), [h2(formula, a) for a in assignments])
+
+    def test_batched_beam(self):
+        print("\n Test Case 13: Batched Beam vs Sorted Beam ")
+        for i in range(6):
+            n = 10 + i
+            random.seed(f"batched/{i}")
+            formula = generate_k_sat(3, int((3 + 0.5 * i) * n), n)
+            for h in (h1, h2):
+                for width in (3, 4):
+                    expected = seeded(lambda: beam_search(formula, n, width, h, max_steps=30), i)
+                    self.assertEqual(seeded(lambda: beam_search(formula, n, width, h, max_steps=30, batched=True), i),
+                                     expected)
+
+class TestRandomWalks(unittest.TestCase):
+
+    def test_models_satisfy(self):
+        print("\n Test Case 14: WalkSAT / ProbSAT Models ")
+        rng = random.Random(6)
+        solved = 0
+        for i in range(40):
+            n = rng.randint(1, 12)
+            formula = random_formula(n, rng.randint(0, 5 * n), rng)
+            satisfiable = brute_force(formula, n)
+            for solver in (walksat, probsat):
+                random.seed(i)
+                assignment, steps, ok = solver(formula, n, max_flips=2000, max_tries=3)
+                if ok:
+                    solved += 1
+                    self.assertTrue(satisfiable)
+                    self.assertTrue(satisfies(formula, assignment))
+                else:
+                    self.assertIsNone(assignment)
+        self.assertTrue(solved > 20)
+
+    def test_failures(self):
+        print("\n Test Case 15: WalkSAT / ProbSAT Failures ")
+        unsat = [[a * 1, b * 2, c * 3] for a in (-1, 1) for b in (-1, 1) for c in (-1, 1)]
+        for solver in (walksat, probsat):
+            self.assertEqual(solver(unsat, 3, max_flips=50, max_tries=2), (None, 100, False))
+            self.assertEqual(solver([[1, 2], []], 2), (None, 0, False))
+            # A random instance near the threshold, cut off after one flip per try.
+            random.seed(7)
+            formula = generate_k_sat(3, 420, 100)
+            self.assertEqual(solver(formula, 100, max_flips=1, max_tries=2), (None, 2, False))
+
+class TestRunExperiments(unittest.TestCase):
+
+    def test_truncate_partial_line(self):
+        print("\n Test Case 16: Truncating a Cut-off Line ")
+        path = os.path.join(tempfile.mkdtemp(), 'lines.jsonl')
+        cases = [(b'', b''), (b'abc', b''), (b'a\n', b'a\n'), (b'aa\nbb\n', b'aa\nbb\n'),
+                 (b'aaaa\n' + b'b' * 17, b'aaaa\n'), (b'x' * 50 + b'\n' + b'y' * 30, b'x' * 50 + b'\n')]
+        for data, expected in cases:
+            with open(path, 'wb') as f:
+                f.write(data)
+            _truncate_partial_line(path, block_size=4)
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), expected)
+
+    def test_resume(self):
+        print("\n Test Case 17: Resuming the Experiment Grid ")
+        output = os.path.join(tempfile.mkdtemp(), 'results.jsonl')
+        tasks = make_tasks([6], [2, 5], 1, ['h1'], ['Hill-Climbing', 'WalkSAT'])
+        first = run_grid(tasks, output, workers=1, log=None)
+        self.assertEqual(first['completed'], 4)
+        with open(output, encoding='utf-8') as f:
+            lines = f.readlines()
+        # One whole record plus half of the second, as left by an interrupt.
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(lines[0])
+            f.write(lines[1][:len(lines[1]) // 2])
+        self.assertEqual(len(completed_tasks(output)), 1)
+        second = run_grid(tasks, output, workers=1, log=None)
+        self.assertEqual((second['skipped'], second['completed']), (1, 3))
+        with open(output, encoding='utf-8') as f:
+            names = [json.loads(line)['task'] for line in f]
+        self.assertEqual(sorted(names), sorted(task['task'] for task in tasks))
+
+if __name__ == '__main__':
+    unittest.main()
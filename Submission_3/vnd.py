@@ -1,7 +1,12 @@
 import random
 from itertools import combinations
 from heuristics import h1
-def vnd(formula, n, h_func, max_tries=10):
+from sat_state import SATState, clause_units
+def vnd(formula, n, h_func, max_tries=10, incremental=False, delta=False, first_improvement=False):
+    if delta:
+        return vnd_delta(formula, n, h_func, max_tries, first_improvement=first_improvement)
+    if incremental:
+        return vnd_incremental(formula, n, h_func, max_tries)
     k_max = 3
     steps = 0
     for t in range(max_tries):
@@ -29,4 +34,103 @@ def vnd(formula, n, h_func, max_tries=10):
                 k = 1
             else:
                 k = k + 1
-    return None, steps, False
\ No newline at end of file
+    return None, steps, False
+
+def vnd_incremental(formula, n, h_func, max_tries=10):
+    # Same neighbourhoods and move order as vnd; a k-flip is scored by flipping
+    # it on a SATState, which costs O(k * occurrences) instead of O(m).
+    k_max = 3
+    steps = 0
+    for t in range(max_tries):
+        assignment = [None] + [random.choice([False, True]) for _ in range(n)]
+        state = SATState(formula, n, assignment)
+        k = 1
+        while k <= k_max:
+            steps += 1
+            if state.num_unsat == 0:
+                return assignment, steps, True
+            current_h = state.score(h_func)
+            best_h = current_h
+            best_flips = None
+            for flips in combinations(range(1, n+1), k):
+                for v in flips[:-1]:
+                    state.flip(v)
+                new_h = state.score(h_func) + state.delta(flips[-1], h_func)
+                if new_h < best_h:
+                    best_h = new_h
+                    best_flips = flips
+                for v in flips[:-1]:
+                    state.flip(v)
+            if best_h < current_h:
+                for v in best_flips:
+                    state.flip(v)
+                k = 1
+            else:
+                k = k + 1
+    return None, steps, False
+
+def _pair_clauses(state):
+    # (u, v) with u < v -> clauses containing both; fixed for a formula.
+    pairs = {}
+    for c, clause_vars in enumerate(state.clause_vars):
+        variables = sorted(v for v, _ in clause_vars)
+        for u, v in combinations(variables, 2):
+            pairs.setdefault((u, v), []).append(c)
+    return pairs
+
+def _move_delta(state, flips, deltas, pairs, units):
+    # Score change of flipping all of `flips`: the single-flip deltas are exact
+    # for clauses holding one of them, and each clause shared by two or more
+    # gets a correction from its true count after the joint flip.
+    total = sum(deltas[v] for v in flips)
+    shared = set()
+    for u, v in combinations(flips, 2):
+        shared.update(pairs.get((u, v), ()))
+    assignment = state.assignment
+    for c in shared:
+        t = state.true_count[c]
+        joint = t
+        for v, w in state.clause_vars[c]:
+            if v in flips:
+                change = -w if assignment[v] else w
+                joint += change
+                total -= units(t + change) - units(t)
+        total += units(joint) - units(t)
+    return total
+
+def vnd_delta(formula, n, h_func, max_tries=10, k_max=3, first_improvement=False):
+    # VND over k-flips of variables from currently unsatisfied clauses, scored
+    # without touching the assignment: cached per-variable deltas plus pairwise
+    # clause corrections. Only improving moves are applied to the SATState.
+    units = clause_units(h_func)
+    steps = 0
+    pairs = None
+    for t in range(max_tries):
+        assignment = [None] + [random.choice([False, True]) for _ in range(n)]
+        state = SATState(formula, n, assignment)
+        if pairs is None:
+            pairs = _pair_clauses(state)
+        k = 1
+        while k <= k_max:
+            steps += 1
+            if state.num_unsat == 0:
+                return assignment, steps, True
+            candidates = sorted({v for c, count in enumerate(state.true_count) if count == 0
+                                 for v, _ in state.clause_vars[c]})
+            deltas = state.deltas(h_func)
+            best_delta = 0
+            best_flips = None
+            for flips in combinations(candidates, k):
+                move = deltas[flips[0]] if k == 1 else _move_delta(state, flips, deltas, pairs, units)
+                if move < best_delta:
+                    best_delta = move
+                    best_flips = flips
+                    if first_improvement:
+                        break
+            if best_flips is not None:
+                for v in best_flips:
+                    state.flip(v)
+                k = 1
+            else:
+                k = k + 1
+    return None, steps, False
@@ -0,0 +1,125 @@
+import random
+
+def _prepare(formula, n):
+    # Duplicate literals are merged and tautologies dropped, so every clause
+    # mentions a variable at most once and the xor of its true variables
+    # names the only true one when its count is 1.
+    clauses = []
+    for clause in formula:
+        lits = set(clause)
+        if not any(-lit in lits for lit in lits):
+            clauses.append(tuple(lits))
+    occurrences = [([], []) for _ in range(n + 1)]
+    for c, clause in enumerate(clauses):
+        for lit in clause:
+            occurrences[abs(lit)][lit < 0].append(c)
+    return clauses, occurrences
+
+class WalkState:
+    # Minimal local-search state: true-literal counts, the xor of the true
+    # variables per clause, break counts, and the unsatisfied clauses as a
+    # list with a position index so adding and removing are O(1).
+    def __init__(self, clauses, occurrences, assignment):
+        self.clauses = clauses
+        self.occurrences = occurrences
+        self.assignment = assignment
+        self.true_count = [0] * len(clauses)
+        self.critical = [0] * len(clauses)
+        self.brk = [0] * len(assignment)
+        self.unsat = []
+        self.unsat_pos = [-1] * len(clauses)
+        for c, clause in enumerate(clauses):
+            for lit in clause:
+                if (lit > 0) == assignment[abs(lit)]:
+                    self.true_count[c] += 1
+                    self.critical[c] ^= abs(lit)
+            if self.true_count[c] == 0:
+                self._add_unsat(c)
+            elif self.true_count[c] == 1:
+                self.brk[self.critical[c]] += 1
+
+    def _add_unsat(self, c):
+        self.unsat_pos[c] = len(self.unsat)
+        self.unsat.append(c)
+
+    def _remove_unsat(self, c):
+        pos = self.unsat_pos[c]
+        last = self.unsat.pop()
+        if last != c:
+            self.unsat[pos] = last
+            self.unsat_pos[last] = pos
+        self.unsat_pos[c] = -1
+
+    def flip(self, v):
+        value = not self.assignment[v]
+        self.assignment[v] = value
+        true_count = self.true_count
+        critical = self.critical
+        brk = self.brk
+        positive, negative = self.occurrences[v]
+        # Clauses where v's literal just became true.
+        for c in (positive if value else negative):
+            t = true_count[c]
+            if t == 0:
+                self._remove_unsat(c)
+                brk[v] += 1
+            elif t == 1:
+                brk[critical[c]] -= 1
+            true_count[c] = t + 1
+            critical[c] ^= v
+        # Clauses where it just became false.
+        for c in (negative if value else positive):
+            t = true_count[c] - 1
+            true_count[c] = t
+            critical[c] ^= v
+            if t == 0:
+                self._add_unsat(c)
+                brk[v] -= 1
+            elif t == 1:
+                brk[critical[c]] += 1
+
+def _walksat_pick(clause, brk, noise):
+    # SKC rule: a variable with break 0 is always taken; otherwise a random
+    # variable with probability noise, else one with the fewest breaks.
+    breaks = [brk[abs(lit)] for lit in clause]
+    best = min(breaks)
+    if best > 0 and random.random() < noise:
+        return abs(random.choice(clause))
+    return abs(random.choice([lit for lit, b in zip(clause, breaks) if b == best]))
+
+def _probsat_pick(clause, brk, cb, eps):
+    # Polynomial break distribution: P(v) proportional to (eps + break(v)) ** -cb.
+    weights = [(eps + brk[abs(lit)]) ** -cb for lit in clause]
+    return abs(random.choices(clause, weights)[0])
+
+def walksat(formula, n, noise=0.567, max_flips=100000, max_tries=10, method='walksat', cb=2.06, eps=0.9):
+    # Random-walk local search. Returns (assignment, steps, solved) like the
+    # other engines, where steps counts flips over all tries.
+    if method not in ('walksat', 'probsat'):
+        raise ValueError(f"Unknown method: {method}")
+    clauses, occurrences = _prepare(formula, n)
+    steps = 0
+    if () in clauses:
+        # An empty clause can never be satisfied and has no variable to flip.
+        return None, steps, False
+    for t in range(max_tries):
+        assignment = [None] + [random.choice([False, True]) for _ in range(n)]
+        state = WalkState(clauses, occurrences, assignment)
+        unsat = state.unsat
+        brk = state.brk
+        for f in range(max_flips):
+            if not unsat:
+                return assignment, steps, True
+            clause = clauses[random.choice(unsat)]
+            if method == 'walksat':
+                v = _walksat_pick(clause, brk, noise)
+            else:
+                v = _probsat_pick(clause, brk, cb, eps)
+            state.flip(v)
+            steps += 1
+        if not unsat:
+            return assignment, steps, True
+    return None, steps, False
+
+def probsat(formula, n, cb=2.06, eps=0.9, max_flips=100000, max_tries=10):
+    return walksat(formula, n, max_flips=max_flips, max_tries=max_tries, method='probsat', cb=cb, eps=eps)
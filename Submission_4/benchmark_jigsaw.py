@@ -0,0 +1,63 @@
+import argparse
+import numpy as np
+from jigsaw_sa_solver import solve_jigsaw, transformations, ALPHA
+
+def synthetic_image(size, rng, waves=6):
+    # Smooth random image (a sum of low-frequency waves plus a ramp) so that
+    # neighbouring tiles have matching edges, scaled to the full uint8 range.
+    y, x = np.mgrid[0:size, 0:size] / size
+    image = x + 0.5 * y
+    for _ in range(waves):
+        fx, fy = rng.uniform(0.5, 4, size=2)
+        phase = rng.uniform(0, 2 * np.pi)
+        image = image + rng.uniform(0.2, 1) * np.sin(2 * np.pi * (fx * x + fy * y) + phase)
+    image = (image - image.min()) / (image.max() - image.min())
+    return (image * 255).astype(np.uint8)
+
+def split_tiles(image, num_tiles):
+    size = image.shape[0] // num_tiles
+    return [image[i * size:(i + 1) * size, j * size:(j + 1) * size]
+            for i in range(num_tiles) for j in range(num_tiles)]
+
+def scramble(image, num_tiles, rng):
+    # Shuffles the tiles and gives each one a random rotation / flip.
+    tiles = split_tiles(image, num_tiles)
+    size = tiles[0].shape[0]
+    scrambled = np.empty_like(image)
+    for pos, src in enumerate(rng.permutation(len(tiles))):
+        i, j = divmod(pos, num_tiles)
+        f = transformations[rng.integers(len(transformations))]
+        scrambled[i * size:(i + 1) * size, j * size:(j + 1) * size] = f(tiles[src])
+    return scrambled
+
+def fraction_correct(solved, original, num_tiles):
+    # Fraction of grid cells holding the right tile in the right orientation,
+    # taking the best of the 8 global rotations / flips, which the energy
+    # cannot tell apart.
+    expected = split_tiles(original, num_tiles)
+    best = 0
+    for f in transformations:
+        found = split_tiles(np.ascontiguousarray(f(solved)), num_tiles)
+        best = max(best, sum(np.array_equal(a, b) for a, b in zip(found, expected)))
+    return best / (num_tiles * num_tiles)
+
+def run_benchmark(grid_sizes=(4, 8, 16), tile_size=32, seed=0, alpha=ALPHA):
+    print(f"{'grid':>6} {'iters':>8} {'iters/s':>9} {'energy':>12} {'correct':>8}")
+    for num_tiles in grid_sizes:
+        rng = np.random.default_rng(seed + num_tiles)
+        original = synthetic_image(num_tiles * tile_size, rng)
+        scrambled = scramble(original, num_tiles, rng)
+        result = solve_jigsaw(scrambled, num_tiles, seed=seed, alpha=alpha, cache_tables=False)
+        rate = result['iterations'] / result['seconds']
+        correct = fraction_correct(result['image'], original, num_tiles)
+        print(f"{num_tiles:>3}x{num_tiles:<2} {result['iterations']:>8} {rate:>9.0f} "
+              f"{result['energy']:>12.1f} {correct:>8.1%}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Jigsaw SA on synthetic puzzles of growing grid size.")
+    parser.add_argument('--grids', type=int, nargs='+', default=[4, 8, 16])
+    parser.add_argument('--tile-size', type=int, default=32)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--alpha', type=float, default=ALPHA, help="cooling rate; closer to 1 anneals longer")
+    args = parser.parse_args()
+    run_benchmark(args.grids, args.tile_size, args.seed, args.alpha)
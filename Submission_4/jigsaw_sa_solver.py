@@ -1,8 +1,9 @@
 import numpy as np
 import random
 import math
-import matplotlib.pyplot as plt
 import os
+import hashlib
+import time
 
 INPUT_PATH = "scrambled_lena.mat"
 NUM_TILES = 4
@@ -13,9 +14,7 @@ MIN_T = 1e-6
 ALPHA = 0.9995
 MAX_ITER = 1200000
 EDGE_COMPARE_WIDTH = 2
-
-random.seed(RANDOM_SEED)
-np.random.seed(RANDOM_SEED)
+DRIFT_TOLERANCE = 1e-6
 
 def load_image_flexible(path):
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -36,17 +35,16 @@ def load_image_flexible(path):
         print(f"Failed to load as text: {e}")
         raise
 
-scrambled = load_image_flexible(INPUT_PATH)
-if scrambled.ndim != 2:
-    raise ValueError("Loaded image must be grayscale (2D).")
-img_size = scrambled.shape[0]
-if scrambled.shape[0] != scrambled.shape[1]:
-    raise ValueError("Image must be square.")
-if img_size % NUM_TILES != 0:
-    raise ValueError(f"Image size {img_size} not divisible by NUM_TILES={NUM_TILES}")
-
-tile_size = img_size // NUM_TILES
-print(f"Loaded image {img_size}x{img_size}, using {NUM_TILES}x{NUM_TILES} grid, tile size {tile_size}x{tile_size}")
+def check_image(image, num_tiles):
+    # Returns the tile size for a square grayscale image split into num_tiles x num_tiles.
+    if image.ndim != 2:
+        raise ValueError("Loaded image must be grayscale (2D).")
+    img_size = image.shape[0]
+    if image.shape[0] != image.shape[1]:
+        raise ValueError("Image must be square.")
+    if img_size % num_tiles != 0:
+        raise ValueError(f"Image size {img_size} not divisible by num_tiles={num_tiles}")
+    return img_size // num_tiles
 
 def transform_identity(x): return x
 def transform_rot90(x): return np.rot90(x, 1)
@@ -62,65 +60,147 @@ transformations = [
     transform_flip_ud, transform_flip_lr, transform_rot90_flip_ud, transform_rot90_flip_lr
 ]
 
-tiles = []
-original_tile_count = NUM_TILES * NUM_TILES
-for i in range(NUM_TILES):
-    for j in range(NUM_TILES):
-        base = scrambled[i * tile_size:(i + 1) * tile_size, j * tile_size:(j + 1) * tile_size]
-        for f in transformations:
-            tiles.append(f(base).copy())
-assert len(tiles) == original_tile_count * TRANSFORMS_PER_TILE
+def make_tiles(image, num_tiles, tile_size):
+    # Every tile in all TRANSFORMS_PER_TILE orientations; variant id = tile * 8 + transform.
+    tiles = []
+    for i in range(num_tiles):
+        for j in range(num_tiles):
+            base = image[i * tile_size:(i + 1) * tile_size, j * tile_size:(j + 1) * tile_size]
+            for f in transformations:
+                tiles.append(f(base).copy())
+    assert len(tiles) == num_tiles * num_tiles * TRANSFORMS_PER_TILE
+    return tiles
 
-grid = (np.arange(original_tile_count) * TRANSFORMS_PER_TILE).reshape(NUM_TILES, NUM_TILES)
-print("Initial grid shape:", grid.shape)
+def initial_grid(num_tiles):
+    return (np.arange(num_tiles * num_tiles) * TRANSFORMS_PER_TILE).reshape(num_tiles, num_tiles)
 
 def tile_gradient(t):
     gx = np.abs(np.gradient(t.astype(np.float32), axis=1))
     gy = np.abs(np.gradient(t.astype(np.float32), axis=0))
     return gx + gy
 
-tile_gradients = [tile_gradient(t) for t in tiles]
+def horizontal_seam_cost(left_tile, right_tile, left_grad, right_grad, width=EDGE_COMPARE_WIDTH):
+    left_cols = left_tile[:, -width:].astype(np.int32)
+    right_cols = right_tile[:, :width].astype(np.int32)
+    cost = np.sum(np.abs(left_cols - right_cols))
+    left_g = left_grad[:, -width:]
+    right_g = right_grad[:, :width]
+    return cost + 0.5 * np.sum(np.abs(left_g - right_g))
+
+def vertical_seam_cost(top_tile, bot_tile, top_grad, bot_grad, width=EDGE_COMPARE_WIDTH):
+    top_rows = top_tile[-width:, :].astype(np.int32)
+    bot_rows = bot_tile[:width, :].astype(np.int32)
+    cost = np.sum(np.abs(top_rows - bot_rows))
+    top_g = top_grad[-width:, :]
+    bot_g = bot_grad[:width, :]
+    return cost + 0.5 * np.sum(np.abs(top_g - bot_g))
+
+def seam_cost(grid, tiles, grads, seam, width=EDGE_COMPARE_WIDTH):
+    # seam = (True, i, j) joins (i, j) with (i, j + 1); (False, i, j) joins (i, j) with (i + 1, j).
+    horizontal, i, j = seam
+    a = grid[i, j]
+    if horizontal:
+        b = grid[i, j + 1]
+        return horizontal_seam_cost(tiles[a], tiles[b], grads[a], grads[b], width)
+    b = grid[i + 1, j]
+    return vertical_seam_cost(tiles[a], tiles[b], grads[a], grads[b], width)
 
 def compute_energy(grid, tiles, grads, tile_size, num_tiles, transforms_per_tile, width=EDGE_COMPARE_WIDTH):
+    # Reference energy straight from the tiles; the SA uses table_energy,
+    # which test_jigsaw.py checks against this.
     energy = 0.0
     for i in range(num_tiles):
         for j in range(num_tiles - 1):
-            left_val = grid[i, j]
-            right_val = grid[i, j + 1]
-            left_tile = tiles[left_val]
-            right_tile = tiles[right_val]
-            left_grad = grads[left_val]
-            right_grad = grads[right_val]
-            left_cols = left_tile[:, -width:].astype(np.int32)
-            right_cols = right_tile[:, :width].astype(np.int32)
-            energy += np.sum(np.abs(left_cols - right_cols))
-            left_g = left_grad[:, -width:]
-            right_g = right_grad[:, :width]
-            energy += 0.5 * np.sum(np.abs(left_g - right_g))
+            energy += seam_cost(grid, tiles, grads, (True, i, j), width)
     for i in range(num_tiles - 1):
         for j in range(num_tiles):
-            top_val = grid[i, j]
-            bot_val = grid[i + 1, j]
-            top_tile = tiles[top_val]
-            bot_tile = tiles[bot_val]
-            top_grad = grads[top_val]
-            bot_grad = grads[bot_val]
-            top_rows = top_tile[-width:, :].astype(np.int32)
-            bot_rows = bot_tile[:width, :].astype(np.int32)
-            energy += np.sum(np.abs(top_rows - bot_rows))
-            top_g = top_grad[-width:, :]
-            bot_g = bot_grad[:width, :]
-            energy += 0.5 * np.sum(np.abs(top_g - bot_g))
+            energy += seam_cost(grid, tiles, grads, (False, i, j), width)
     return energy
 
+def seams_touching(cells, num_tiles):
+    # At most four seams per cell, eight for a two-cell move.
+    seams = set()
+    for i, j in cells:
+        if j > 0: seams.add((True, i, j - 1))
+        if j < num_tiles - 1: seams.add((True, i, j))
+        if i > 0: seams.add((False, i - 1, j))
+        if i < num_tiles - 1: seams.add((False, i, j))
+    return seams
+
+def build_seam_tables(tiles, grads, width=EDGE_COMPARE_WIDTH, chunk=64):
+    # h_table[a, b]: cost of variant a directly left of variant b; v_table[a, b]:
+    # a directly above b. Same terms as the seam cost functions, pixel and
+    # 0.5 * gradient differences, computed for all pairs with broadcasting.
+    tiles = np.asarray(tiles)
+    grads = np.asarray(grads, dtype=np.float64)
+    count = len(tiles)
+    edges = {
+        'h': (tiles[:, :, -width:], tiles[:, :, :width], grads[:, :, -width:], grads[:, :, :width]),
+        'v': (tiles[:, -width:, :], tiles[:, :width, :], grads[:, -width:, :], grads[:, :width, :]),
+    }
+    tables = {}
+    for name, (first, second, first_g, second_g) in edges.items():
+        first = first.reshape(count, -1).astype(np.int32)
+        second = second.reshape(count, -1).astype(np.int32)
+        first_g = first_g.reshape(count, -1)
+        second_g = second_g.reshape(count, -1)
+        table = np.empty((count, count))
+        for start in range(0, count, chunk):
+            stop = start + chunk
+            pixels = np.abs(first[start:stop, None, :] - second[None, :, :]).sum(axis=2)
+            gradient = np.abs(first_g[start:stop, None, :] - second_g[None, :, :]).sum(axis=2)
+            table[start:stop] = pixels + 0.5 * gradient
+        tables[name] = table
+    return tables['h'], tables['v']
+
+def load_seam_tables(image, tiles, grads, num_tiles, width=EDGE_COMPARE_WIDTH, cache_dir=None):
+    # Tables depend only on the image, the grid size and the edge width, so
+    # they are cached as .npz files named by a hash of those.
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.seam_cache')
+    digest = hashlib.sha1(np.ascontiguousarray(image).tobytes())
+    digest.update(f"{image.shape}/{image.dtype}/{num_tiles}/{width}".encode())
+    path = os.path.join(cache_dir, f"seam_tables_{digest.hexdigest()}.npz")
+    if os.path.exists(path):
+        with np.load(path) as data:
+            return data['h'], data['v']
+    h_table, v_table = build_seam_tables(tiles, grads, width)
+    os.makedirs(cache_dir, exist_ok=True)
+    np.savez(path, h=h_table, v=v_table)
+    return h_table, v_table
+
+def table_energy(grid, h_table, v_table):
+    return float(h_table[grid[:, :-1], grid[:, 1:]].sum() + v_table[grid[:-1, :], grid[1:, :]].sum())
+
+def local_energy(grid, seams, h_rows, v_rows):
+    # h_rows / v_rows are the tables as nested lists, which index faster than numpy scalars.
+    total = 0.0
+    for horizontal, i, j in seams:
+        if horizontal:
+            total += h_rows[grid[i, j]][grid[i, j + 1]]
+        else:
+            total += v_rows[grid[i, j]][grid[i + 1, j]]
+    return total
+
 def simulated_annealing(grid, tiles, grads, tile_size, num_tiles, transforms_per_tile,
-                        initial_T=INITIAL_T, min_T=MIN_T, alpha=ALPHA, max_iter=MAX_ITER):
+                        initial_T=INITIAL_T, min_T=MIN_T, alpha=ALPHA, max_iter=MAX_ITER,
+                        check_every=10000, tables=None, stats=None):
+    # Each move is scored from the seams around the cells it changes, looked
+    # up in the seam tables. Pixel terms are integers and gradient terms
+    # multiples of 0.25, so the deltas are exact and the run matches full
+    # re-evaluation for the same seed; every check_every iterations the full
+    # energy is recomputed and a running value that drifted from it raises.
+    if tables is None:
+        tables = build_seam_tables(tiles, grads)
+    h_table, v_table = tables
+    h_rows, v_rows = h_table.tolist(), v_table.tolist()
     current_grid = grid.copy()
-    current_energy = compute_energy(current_grid, tiles, grads, tile_size, num_tiles, transforms_per_tile)
+    current_energy = table_energy(current_grid, h_table, v_table)
     T = initial_T
     best_grid = current_grid.copy()
     best_energy = current_energy
 
+    it = 0
     for it in range(1, max_iter + 1):
         move_type = random.choices(
             ["swap_positions", "swap_transforms", "change_transform", "rotate_transform"],
@@ -132,12 +212,16 @@ def simulated_annealing(grid, tiles, grads, tile_size, num_tiles, transforms_per
             i1, j1 = random.randrange(num_tiles), random.randrange(num_tiles)
             i2, j2 = random.randrange(num_tiles), random.randrange(num_tiles)
             if i1 == i2 and j1 == j2: continue
+            seams = seams_touching(((i1, j1), (i2, j2)), num_tiles)
+            old_local = local_energy(current_grid, seams, h_rows, v_rows)
             a = current_grid[i1, j1]; b = current_grid[i2, j2]
             current_grid[i1, j1], current_grid[i2, j2] = b, a
             undo_info = ("swap_positions", (i1, j1, i2, j2, a, b))
         elif move_type == "swap_transforms":
             i1, j1 = random.randrange(num_tiles), random.randrange(num_tiles)
             i2, j2 = random.randrange(num_tiles), random.randrange(num_tiles)
+            seams = seams_touching(((i1, j1), (i2, j2)), num_tiles)
+            old_local = local_energy(current_grid, seams, h_rows, v_rows)
             v1 = current_grid[i1, j1]; v2 = current_grid[i2, j2]
             b1 = v1 // transforms_per_tile; t1 = v1 % transforms_per_tile
             b2 = v2 // transforms_per_tile; t2 = v2 % transforms_per_tile
@@ -146,6 +230,8 @@ def simulated_annealing(grid, tiles, grads, tile_size, num_tiles, transforms_per
             undo_info = ("swap_transforms", (i1, j1, i2, j2, v1, v2))
         elif move_type == "change_transform":
             i, j = random.randrange(num_tiles), random.randrange(num_tiles)
+            seams = seams_touching(((i, j),), num_tiles)
+            old_local = local_energy(current_grid, seams, h_rows, v_rows)
             old = int(current_grid[i, j])
             base_idx = old // transforms_per_tile
             new_t = random.randrange(transforms_per_tile)
@@ -154,6 +240,8 @@ def simulated_annealing(grid, tiles, grads, tile_size, num_tiles, transforms_per
             undo_info = ("change_transform", (i, j, old))
         else:  
             i, j = random.randrange(num_tiles), random.randrange(num_tiles)
+            seams = seams_touching(((i, j),), num_tiles)
+            old_local = local_energy(current_grid, seams, h_rows, v_rows)
             old = int(current_grid[i, j])
             base_idx = old // transforms_per_tile
             cur_t = old % transforms_per_tile
@@ -162,8 +250,8 @@ def simulated_annealing(grid, tiles, grads, tile_size, num_tiles, transforms_per
             current_grid[i, j] = new_val
             undo_info = ("change_transform", (i, j, old))
 
-        new_energy = compute_energy(current_grid, tiles, grads, tile_size, num_tiles, transforms_per_tile)
-        delta = new_energy - current_energy
+        delta = local_energy(current_grid, seams, h_rows, v_rows) - old_local
+        new_energy = current_energy + delta
         accept = False
         if delta <= 0:
             accept = True
@@ -188,22 +276,70 @@ def simulated_annealing(grid, tiles, grads, tile_size, num_tiles, transforms_per
                 i, j, old = info
                 current_grid[i, j] = old
 
+        if it % check_every == 0:
+            full_energy = table_energy(current_grid, h_table, v_table)
+            if abs(full_energy - current_energy) > DRIFT_TOLERANCE * max(1.0, abs(full_energy)):
+                raise RuntimeError(f"Energy drift at iteration {it}: running {current_energy}, "
+                                   f"recomputed {full_energy}")
+            current_energy = full_energy
+
         T *= alpha
         if T < min_T:
             break
 
+    if stats is not None:
+        stats['iterations'] = it
     return best_grid, best_energy
 
-best_grid, best_energy = simulated_annealing(grid, tiles, tile_gradients, tile_size, NUM_TILES, TRANSFORMS_PER_TILE)
-print(f"Solved with energy: {best_energy} after {MAX_ITER} iterations")
+def assemble(grid, tiles, num_tiles, tile_size):
+    image = np.zeros((num_tiles * tile_size, num_tiles * tile_size), dtype=np.uint8)
+    for i in range(num_tiles):
+        for j in range(num_tiles):
+            image[i * tile_size:(i + 1) * tile_size, j * tile_size:(j + 1) * tile_size] = tiles[int(grid[i, j])]
+    return image
+
+def solve_jigsaw(image, num_tiles=NUM_TILES, seed=RANDOM_SEED, max_iter=MAX_ITER, initial_T=INITIAL_T,
+                 min_T=MIN_T, alpha=ALPHA, cache_tables=True, cache_dir=None):
+    # Unscrambles a square grayscale image cut into num_tiles x num_tiles
+    # tiles. Returns the best grid of variant ids, its energy, the assembled
+    # image, the iterations run and the seconds spent annealing.
+    tile_size = check_image(image, num_tiles)
+    tiles = make_tiles(image, num_tiles, tile_size)
+    grads = [tile_gradient(t) for t in tiles]
+    if cache_tables:
+        tables = load_seam_tables(image, tiles, grads, num_tiles, cache_dir=cache_dir)
+    else:
+        tables = build_seam_tables(tiles, grads)
+    random.seed(seed)
+    np.random.seed(seed)
+    stats = {}
+    start = time.perf_counter()
+    best_grid, best_energy = simulated_annealing(initial_grid(num_tiles), tiles, grads, tile_size, num_tiles,
+                                                 TRANSFORMS_PER_TILE, initial_T, min_T, alpha, max_iter,
+                                                 tables=tables, stats=stats)
+    seconds = time.perf_counter() - start
+    return {
+        'grid': best_grid,
+        'energy': best_energy,
+        'image': assemble(best_grid, tiles, num_tiles, tile_size),
+        'iterations': stats['iterations'],
+        'seconds': seconds
+    }
+
+def main():
+    # pyplot is only needed to show the result, not to import the solver.
+    import matplotlib.pyplot as plt
+    scrambled = load_image_flexible(INPUT_PATH)
+    tile_size = check_image(scrambled, NUM_TILES)
+    img_size = scrambled.shape[0]
+    print(f"Loaded image {img_size}x{img_size}, using {NUM_TILES}x{NUM_TILES} grid, tile size {tile_size}x{tile_size}")
+    print("Initial grid shape:", initial_grid(NUM_TILES).shape)
+    result = solve_jigsaw(scrambled, NUM_TILES)
+    print(f"Solved with energy: {result['energy']} after {result['iterations']} iterations")
 
-unscrambled = np.zeros_like(scrambled, dtype=np.uint8)
-for i in range(NUM_TILES):
-    for j in range(NUM_TILES):
-        val = int(best_grid[i, j])
-        tile = tiles[val]
-        unscrambled[i * tile_size:(i + 1) * tile_size, j * tile_size:(j + 1) * tile_size] = tile
+    plt.imshow(result['image'], cmap='gray')
+    plt.axis('off')
+    plt.show()
 
-plt.imshow(unscrambled, cmap='gray')
-plt.axis('off')
-plt.show()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import unittest
+import random
+import tempfile
+from unittest import mock
+import numpy as np
+import jigsaw_sa_solver
+from jigsaw_sa_solver import (make_tiles, tile_gradient, build_seam_tables, load_seam_tables,
+                              table_energy, compute_energy, simulated_annealing, initial_grid,
+                              TRANSFORMS_PER_TILE)
+
+def random_grids(num_tiles, rng, count):
+    # Every tile once, in a random cell and orientation.
+    for _ in range(count):
+        bases = rng.permutation(num_tiles * num_tiles)
+        transforms = rng.integers(TRANSFORMS_PER_TILE, size=num_tiles * num_tiles)
+        yield (bases * TRANSFORMS_PER_TILE + transforms).reshape(num_tiles, num_tiles)
+
+class TestSeamTables(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+
+    def check_tables(self, image, num_tiles, tables):
+        tile_size = image.shape[0] // num_tiles
+        tiles = make_tiles(image, num_tiles, tile_size)
+        grads = [tile_gradient(t) for t in tiles]
+        for grid in random_grids(num_tiles, self.rng, 20):
+            self.assertEqual(table_energy(grid, *tables),
+                             compute_energy(grid, tiles, grads, tile_size, num_tiles, TRANSFORMS_PER_TILE))
+
+    def test_table_energy_matches_reference(self):
+        print("\n Test Case 1: Table Energy vs compute_energy ")
+        for num_tiles, tile_size in ((2, 8), (3, 6), (4, 5)):
+            image = self.rng.integers(0, 256, (num_tiles * tile_size,) * 2).astype(np.uint8)
+            tiles = make_tiles(image, num_tiles, tile_size)
+            grads = [tile_gradient(t) for t in tiles]
+            self.check_tables(image, num_tiles, build_seam_tables(tiles, grads, chunk=7))
+
+    def test_cached_tables(self):
+        print("\n Test Case 2: Tables Loaded from the Cache ")
+        cache_dir = tempfile.mkdtemp()
+        image = self.rng.integers(0, 256, (24, 24)).astype(np.uint8)
+        tiles = make_tiles(image, 3, 8)
+        grads = [tile_gradient(t) for t in tiles]
+        built = load_seam_tables(image, tiles, grads, 3, cache_dir=cache_dir)
+        cached = load_seam_tables(image, tiles, grads, 3, cache_dir=cache_dir)
+        self.assertTrue(np.array_equal(built[0], cached[0]) and np.array_equal(built[1], cached[1]))
+        self.check_tables(image, 3, cached)
+
+    def test_drift_check(self):
+        print("\n Test Case 3: Energy Drift Check ")
+        image = self.rng.integers(0, 256, (24, 24)).astype(np.uint8)
+        tiles = make_tiles(image, 3, 8)
+        grads = [tile_gradient(t) for t in tiles]
+        tables = build_seam_tables(tiles, grads)
+        random.seed(0)
+        grid, energy = simulated_annealing(initial_grid(3), tiles, grads, 8, 3, TRANSFORMS_PER_TILE,
+                                           max_iter=3000, check_every=100, tables=tables)
+        self.assertEqual(energy, table_energy(grid, *tables))
+        # Noise added to every local energy makes the running deltas wrong.
+        local_energy = jigsaw_sa_solver.local_energy
+        wrong = lambda grid, seams, h_rows, v_rows: local_energy(grid, seams, h_rows, v_rows) + random.random()
+        with mock.patch.object(jigsaw_sa_solver, 'local_energy', wrong):
+            with self.assertRaises(RuntimeError):
+                simulated_annealing(initial_grid(3), tiles, grads, 8, 3, TRANSFORMS_PER_TILE,
+                                    max_iter=3000, check_every=100, tables=tables)
+
+if __name__ == '__main__':
+    unittest.main()